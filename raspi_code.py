@@ -2,12 +2,19 @@ import socket
 import time
 import threading
 import requests
-import subprocess
-import signal
-from collections import deque
+import select
+import ctypes
+import errno
+import fcntl
+import sched
 from datetime import datetime
 import atexit
 import os
+import sys
+import signal
+import queue
+import multiprocessing
+import numpy as np
 
 # GPIO imports with error handling
 try:
@@ -19,6 +26,21 @@ except ImportError:
     print("gpiozero not available - running in simulation mode")
     GPIO_AVAILABLE = False
 
+# Fast JSON encoding for web server updates
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json
+    print("orjson not available - using standard json module")
+    ORJSON_AVAILABLE = False
+
+def dumps_json(obj):
+    """Serialize obj to JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
 WEB_SERVER_URL = "http://10.8.31.157:5000" 
 WEB_SERVER_ENDPOINT = f"{WEB_SERVER_URL}/api/data"
 
@@ -26,10 +48,16 @@ WEB_SERVER_ENDPOINT = f"{WEB_SERVER_URL}/api/data"
 LOCAL_IP = "192.168.1.10"  # This Raspberry Pi's IP address
 UDP_PORT = 4210            # Port for receiving UDP messages from ESP32
 BROADCAST_IP = "192.168.1.255"  # Your network's broadcast address
+SOCKET_BUFFER_SIZE = 4 * 1024 * 1024  # Kernel socket buffer to absorb packet bursts
+UDP_BATCH_SIZE = 32        # Max datagrams read per recvmmsg() call
+UDP_PACKET_SIZE = 2048     # Receive slot size; covers a full Ethernet MTU datagram
+UDP_DROP_CHECK_INTERVAL = 10  # seconds between kernel drop counter checks while logging
+UDP_RECEIVER_PROCESS = False  # Receive and parse UDP in a separate process (uses a second core)
 
 # Button and LED configuration
 BUTTON_PIN = 24  # GPIO pin for reset button
 YELLOW_LED_PIN = 18  # GPIO pin for status/reset LED
+INSTANCE_LOCK_FILE = "/tmp/swarm.lock"  # Held while this monitor owns the GPIO pins
 
 # Node mapping - Map ESP32 IP addresses to LED names and GPIO pins
 # Format: "ESP32_IP": ("COLOR_NAME", GPIO_PIN)
@@ -42,11 +70,17 @@ ip_led_map = {
 # Data retention settings
 TIME_WINDOW = 30  # seconds - how long to keep data in graphs
 MAX_DATA_POINTS = 1000  # maximum number of data points to store
+LOG_FILES_REFRESH_INTERVAL = 10  # seconds between log directory rescans
+WEB_HEARTBEAT_INTERVAL = 5  # seconds between web updates while nothing changes
+LOG_FLUSH_INTERVAL = 1.0  # seconds between log file flushes during a session
+LOG_FLUSH_EVERY = 64      # flush early after this many buffered rows
+LOG_BATCH_SIZE = 256      # max queued rows the logger thread writes per wakeup
 
 # LED Matrix Graph Settings
 GRAPH_TIME_WINDOW = 30  # 30 seconds of data to display
 ROW_TIME = 30.0 / 8.0   # Each row represents 3.75 seconds (30s / 8 rows)
 NUM_ROWS = 8            # 8 rows for 8x8 matrix
+MATRIX_SPI_SPEED_HZ = 10000000  # MAX7219 max is 10 MHz; use 5000000 with long jumper wires
 
 # Matrix column layout: [Dev0 Col0, Dev0 Col1, BLANK, Dev1 Col0, Dev1 Col1, BLANK, Dev2 Col0, Dev2 Col1]
 DEVICE_COLUMNS = {
@@ -73,6 +107,19 @@ except ImportError as e:
     print("  Install with: pip3 install spidev")
     matrix_imports_available = False
 
+class _SpiIocTransfer(ctypes.Structure):
+    """struct spi_ioc_transfer from <linux/spi/spidev.h>"""
+    _fields_ = [('tx_buf', ctypes.c_uint64), ('rx_buf', ctypes.c_uint64),
+                ('len', ctypes.c_uint32), ('speed_hz', ctypes.c_uint32),
+                ('delay_usecs', ctypes.c_uint16), ('bits_per_word', ctypes.c_uint8),
+                ('cs_change', ctypes.c_uint8), ('tx_nbits', ctypes.c_uint8),
+                ('rx_nbits', ctypes.c_uint8), ('word_delay_usecs', ctypes.c_uint8),
+                ('pad', ctypes.c_uint8)]
+
+def _spi_ioc_message(count):
+    """SPI_IOC_MESSAGE(count) ioctl request number"""
+    return (1 << 30) | ((count * ctypes.sizeof(_SpiIocTransfer)) << 16) | (ord('k') << 8)
+
 class MAX7219:
     """Direct SPI control for MAX7219 LED matrix"""
     # MAX7219 Registers
@@ -94,8 +141,25 @@ class MAX7219:
     def __init__(self, bus=0, device=0):
         self.spi = spidev.SpiDev()
         self.spi.open(bus, device)
-        self.spi.max_speed_hz = 1000000
+        self.spi.max_speed_hz = MATRIX_SPI_SPEED_HZ
         self.spi.mode = 0
+        self.row_cache = [0] * 8
+        
+        # Frame buffer of (register, data) pairs sent as one SPI_IOC_MESSAGE.
+        # The MAX7219 latches each pair on the CS rising edge, so every pair is
+        # its own transfer with cs_change set between them.
+        self._frame = (ctypes.c_uint8 * 16)()
+        self._transfers = (_SpiIocTransfer * 8)()
+        for i in range(8):
+            self._transfers[i].len = 2
+        self._batched = hasattr(self.spi, 'fileno')
+        self._last_frame = [-1] * 8  # Rows as last written to the display
+        
+        # Row bits lit per device for each bar value (0 = off, 1 = one column, 2 = both)
+        self._bits = [
+            [0, 1 << cols[0], (1 << cols[0]) | (1 << cols[1])]
+            for cols in (DEVICE_COLUMNS[idx] for idx in range(3))
+        ]
         
         # Initialize display
         self.write_register(self.REG_SCANLIMIT, 0x07)
@@ -111,38 +175,54 @@ class MAX7219:
         
     def clear(self):
         """Clear all LEDs"""
-        for row in range(8):
-            self.write_register(self.REG_DIGIT0 + row, 0x00)
+        self.write_rows([0] * 8)
+    
+    def write_rows(self, rows):
+        """Write the rows that changed since the last frame in a single SPI syscall"""
+        changed = [row for row in range(8) if rows[row] != self._last_frame[row]]
+        if not changed:
+            return
+        
+        if self._batched:
+            base = ctypes.addressof(self._frame)
+            for i, row in enumerate(changed):
+                self._frame[2 * i] = self.REG_DIGIT0 + row
+                self._frame[2 * i + 1] = rows[row]
+                self._transfers[i].tx_buf = base + 2 * i
+                self._transfers[i].cs_change = 1 if i < len(changed) - 1 else 0
+            try:
+                fcntl.ioctl(self.spi.fileno(), _spi_ioc_message(len(changed)), self._transfers)
+                self._last_frame = list(rows)
+                return
+            except (OSError, ValueError) as e:
+                print(f"Batched SPI write failed, using per-row writes: {e}")
+                self._batched = False
+        
+        for row in changed:
+            self.write_register(self.REG_DIGIT0 + row, rows[row])
+        self._last_frame = list(rows)
     
     def set_row(self, row, value):
         """Set a row (0-7) to a byte value (0-255)"""
         if 0 <= row <= 7:
             self.write_register(self.REG_DIGIT0 + row, value)
+            self._last_frame[row] = value
     
     def display_row_graph(self, device_row_data):
         """Display time-series graph where each row represents a time slice"""
-        if not hasattr(self, 'row_cache'):
-            self.row_cache = [0] * 8
-        
-        self.row_cache = [0] * 8
+        devices = [(self._bits[idx], device_row_data[idx])
+                   for idx in range(3) if idx in device_row_data]
         
         for row in range(8):
             row_byte = 0
             
-            for device_idx in range(3):
-                if device_idx in device_row_data and row < len(device_row_data[device_idx]):
-                    value = device_row_data[device_idx][row]
-                    cols = DEVICE_COLUMNS[device_idx]
-                    
-                    if value >= 1:
-                        row_byte |= (1 << cols[0])
-                    if value >= 2:
-                        row_byte |= (1 << cols[1])
+            for bits, values in devices:
+                if row < len(values) and values[row] > 0:
+                    row_byte |= bits[min(values[row], 2)]
             
             self.row_cache[row] = row_byte
         
-        for row in range(8):
-            self.set_row(row, self.row_cache[row])
+        self.write_rows(self.row_cache)
     
     def close(self):
         """Close SPI connection"""
@@ -181,7 +261,7 @@ def init_led_matrix():
             2: [2, 2, 1, 1, 2, 0, 1, 2]
         }
         matrix_device.display_row_graph(test_data)
-        print("Test graph displayed on matrix")
+        print(f"Test graph displayed on matrix (SPI {MATRIX_SPI_SPEED_HZ // 1000000} MHz)")
         
         time.sleep(2)
         matrix_device.clear()
@@ -203,66 +283,310 @@ def init_led_matrix():
 
 shutdown_flag = threading.Event()
 
+# Single scheduler thread for delayed callbacks (instead of one Timer thread each).
+# Entering an event sets the wakeup so a sleeping scheduler re-checks its queue.
+scheduler_wakeup = threading.Event()
+
+def _scheduler_delay(seconds):
+    scheduler_wakeup.wait(seconds)
+    scheduler_wakeup.clear()
+
+scheduler = sched.scheduler(time.monotonic, _scheduler_delay)
+yellow_off_event = None
+
 # Current values from each node
 node_values = {ip: 0 for ip in ip_led_map}
 node_is_master = {ip: False for ip in ip_led_map}
 last_update_time = {ip: None for ip in ip_led_map}
+current_master_ip = None  # Node whose MASTER message was seen last (its LED is on)
+
+# Device index used for compact per-sample storage (same order as matrix columns)
+device_ips = sorted(ip_led_map.keys())
+ip_to_idx = {ip: idx for idx, ip in enumerate(device_ips)}
+node_names = {ip: name for ip, (name, _) in ip_led_map.items()}
+
+# Directory holding this script and its session log files
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+class SampleRing:
+    """Fixed-size struct-of-arrays ring buffer of sensor samples.
+    
+    Every column is allocated twice the capacity and each sample is written
+    to both halves, so the live samples are always one contiguous slice that
+    NumPy can scan without copying or unwrapping.
+    """
+    
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.ts = np.zeros(2 * capacity, dtype=np.float64)
+        self.ip_idx = np.zeros(2 * capacity, dtype=np.uint8)
+        self.value = np.zeros(2 * capacity, dtype=np.int16)
+        self.is_master = np.zeros(2 * capacity, dtype=np.bool_)
+        self.head = 0  # Absolute index of the next write
+        self.tail = 0  # Absolute index of the oldest live sample
+    
+    def __len__(self):
+        return self.head - self.tail
+    
+    def append(self, timestamp, ip_idx, value, is_master):
+        """Store one sample, overwriting the oldest when full"""
+        pos = self.head % self.capacity
+        for slot in (pos, pos + self.capacity):
+            self.ts[slot] = timestamp
+            self.ip_idx[slot] = ip_idx
+            self.value[slot] = value
+            self.is_master[slot] = is_master
+        self.head += 1
+        if self.head - self.tail > self.capacity:
+            self.tail = self.head - self.capacity
+    
+    def clear(self):
+        """Drop all live samples"""
+        self.tail = self.head
+    
+    def oldest(self):
+        """Return the timestamp of the oldest live sample, or None if empty"""
+        if self.head == self.tail:
+            return None
+        return float(self.ts[self.tail % self.capacity])
+    
+    def discard_before(self, cutoff_time):
+        """Advance the tail past samples older than cutoff_time"""
+        start = self.tail % self.capacity
+        live_ts = self.ts[start:start + (self.head - self.tail)]
+        self.tail += int(np.searchsorted(live_ts, cutoff_time))
+    
+    def window(self, first=None):
+        """Return (ts, ip_idx, value, is_master) views of the live samples.
+        
+        If first is given, the view starts at that absolute index instead of
+        the tail, reaching back past discarded samples that have not been
+        overwritten yet.
+        """
+        first = self.tail if first is None else max(first, self.head - self.capacity)
+        start = first % self.capacity
+        end = start + (self.head - first)
+        return (self.ts[start:end], self.ip_idx[start:end],
+                self.value[start:end], self.is_master[start:end])
+
+def master_durations_in_window(ts, ip_idx, is_master, current_time):
+    """Seconds each device spent as master, indexed by device index.
+    
+    Consecutive MASTER samples from the same device add the time between
+    them; the most recent master is credited up to current_time.
+    """
+    durations = np.zeros(len(device_ips), dtype=np.float64)
+    master_ts = ts[is_master]
+    if master_ts.size == 0:
+        return durations
+    
+    master_ip = ip_idx[is_master]
+    same = master_ip[1:] == master_ip[:-1]
+    durations += np.bincount(master_ip[1:][same], weights=np.diff(master_ts)[same],
+                             minlength=len(device_ips))
+    durations[master_ip[-1]] += current_time - master_ts[-1]
+    return durations
 
 # Data storage for graphs
-graph_data_unified = deque(maxlen=MAX_DATA_POINTS)
+graph_ring = SampleRing(MAX_DATA_POINTS)
 master_duration_data = {ip: 0.0 for ip in ip_led_map}
 graph_start_time = None
 
 # Session tracking - Button-based logging
 logging_active = False
 session_start_time = None
-session_data = deque(maxlen=MAX_DATA_POINTS)
+session_start_idx = 0  # graph_ring index of the first sample in the session
 all_masters_in_session = set()
 
+# Worker threads, joined on shutdown
+worker_threads = []
+
+# UDP receiver process (when UDP_RECEIVER_PROCESS is enabled)
+receiver_process = None
+receiver_stop_event = None
+
 # GPIO objects
+instance_lock_fd = None
 yellow_led = None
 led_objects = {}
 reset_button = None
 
 # UDP Socket setup
+# The kernel caps SO_RCVBUF/SO_SNDBUF at net.core.rmem_max/wmem_max, so raise
+# those on the Pi for the full size to take effect:
+#   sudo sysctl -w net.core.rmem_max=12582912
+#   sudo sysctl -w net.core.wmem_max=12582912
+#   sudo sysctl -w net.core.netdev_max_backlog=5000
 recv_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 recv_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+recv_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
 recv_sock.bind(('', UDP_PORT))
 
 send_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 send_sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+send_sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+
+# Persistent HTTP session so web server updates reuse one keep-alive connection
+_http = requests.Session()
+_http.headers.update({'Content-Type': 'application/json'})
+_http.mount('http://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1))
 
 # Logging
 log_file = None
 log_filename = None
+log_writes_since_flush = 0
+log_last_flush = 0.0
 
-# Track last sent log files list
+# Rows are queued by the UDP path and written by the logger thread, so packet
+# handling never waits on SD card writes. log_lock serializes log_file access
+# between the logger thread and session start/stop.
+log_queue = queue.SimpleQueue()
+log_lock = threading.Lock()
+
+# Kernel drop counter for recv_sock (/proc/net/udp) at session start and at
+# the last periodic check
+session_start_drops = None
+udp_drops_seen = None
+
+# Track last sent log files list (rescanned on session changes or every
+# LOG_FILES_REFRESH_INTERVAL seconds instead of on every web update)
 last_log_files_sent = []
+log_files_dirty = True
+log_files_scanned_at = 0.0
+
+# Set whenever node or graph state changes; the web update loop only posts
+# when it is set (or every WEB_HEARTBEAT_INTERVAL seconds as a heartbeat)
+state_dirty = True
+
+# ============================================================================
+# UDP BATCH RECEIVE (recvmmsg)
+# ============================================================================
+
+MSG_WAITFORONE = 0x10000
+
+def read_udp_drops(sock=recv_sock):
+    """Return the kernel's dropped-datagram count for sock, or None if unavailable"""
+    try:
+        inode = str(os.fstat(sock.fileno()).st_ino)
+        with open('/proc/net/udp') as f:
+            next(f)
+            for line in f:
+                fields = line.split()
+                if fields[9] == inode:
+                    return int(fields[-1])
+    except (OSError, ValueError, IndexError, StopIteration):
+        pass
+    return None
+
+class _IoVec(ctypes.Structure):
+    _fields_ = [('iov_base', ctypes.c_void_p), ('iov_len', ctypes.c_size_t)]
+
+class _SockAddrIn(ctypes.Structure):
+    _fields_ = [('sin_family', ctypes.c_ushort), ('sin_port', ctypes.c_uint16),
+                ('sin_addr', ctypes.c_uint8 * 4), ('sin_zero', ctypes.c_uint8 * 8)]
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [('msg_name', ctypes.c_void_p), ('msg_namelen', ctypes.c_uint32),
+                ('msg_iov', ctypes.POINTER(_IoVec)), ('msg_iovlen', ctypes.c_size_t),
+                ('msg_control', ctypes.c_void_p), ('msg_controllen', ctypes.c_size_t),
+                ('msg_flags', ctypes.c_int)]
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [('msg_hdr', _MsgHdr), ('msg_len', ctypes.c_uint)]
+
+class BatchReceiver:
+    """Read up to UDP_BATCH_SIZE datagrams per syscall using Linux recvmmsg(2)"""
+
+    def __init__(self, sock, batch_size=UDP_BATCH_SIZE, packet_size=UDP_PACKET_SIZE):
+        self.sock = sock
+        self.batch_size = batch_size
+        self.packet_size = packet_size
+        self._recvmmsg = None
+        self._ip_cache = {}  # raw sin_addr bytes -> interned dotted-quad string
+
+        # Single receive buffer for the recvfrom_into fallback
+        self._view = memoryview(bytearray(packet_size))
+
+        try:
+            libc = ctypes.CDLL("libc.so.6", use_errno=True)
+            self._recvmmsg = libc.recvmmsg
+            self._recvmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr),
+                                       ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+            self._recvmmsg.restype = ctypes.c_int
+        except (OSError, AttributeError):
+            self._recvmmsg = None
+            return
+
+        # Preallocated slots: one packet buffer, iovec and sockaddr per message
+        self._buffer = (ctypes.c_char * (batch_size * packet_size))()
+        self._view = memoryview(self._buffer).cast('B')
+        self._iovecs = (_IoVec * batch_size)()
+        self._addrs = (_SockAddrIn * batch_size)()
+        self._hdrs = (_MMsgHdr * batch_size)()
+        base = ctypes.addressof(self._buffer)
+
+        for i in range(batch_size):
+            self._iovecs[i].iov_base = base + i * packet_size
+            self._iovecs[i].iov_len = packet_size
+            hdr = self._hdrs[i].msg_hdr
+            hdr.msg_name = ctypes.addressof(self._addrs[i])
+            hdr.msg_iov = ctypes.pointer(self._iovecs[i])
+            hdr.msg_iovlen = 1
+
+    @property
+    def batched(self):
+        return self._recvmmsg is not None
+
+    def receive(self):
+        """Return a list of (data, sender_ip) for all datagrams currently queued
+        
+        data is a memoryview into a reused buffer, valid until the next call.
+        """
+        if not self.batched:
+            length, addr = self.sock.recvfrom_into(self._view, self.packet_size)
+            return [(self._view[:length], sys.intern(addr[0]))]
+
+        addr_len = ctypes.sizeof(_SockAddrIn)
+        for i in range(self.batch_size):
+            self._hdrs[i].msg_hdr.msg_namelen = addr_len
+
+        count = self._recvmmsg(self.sock.fileno(), self._hdrs, self.batch_size,
+                               MSG_WAITFORONE, None)
+        if count < 0:
+            err = ctypes.get_errno()
+            if err in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                return []
+            raise OSError(err, os.strerror(err))
+
+        packets = []
+        for i in range(count):
+            offset = i * self.packet_size
+            length = self._hdrs[i].msg_len
+            raw_addr = bytes(self._addrs[i].sin_addr)
+            sender_ip = self._ip_cache.get(raw_addr)
+            if sender_ip is None:
+                sender_ip = sys.intern(socket.inet_ntoa(raw_addr))
+                self._ip_cache[raw_addr] = sender_ip
+            packets.append((self._view[offset:offset + length], sender_ip))
+        return packets
 
 # ============================================================================
 # GPIO CLEANUP AND INITIALIZATION
 # ============================================================================
 
-def kill_other_gpio_processes():
-    """Kill any other Python processes using GPIO"""
+def acquire_instance_lock():
+    """Ensure only one monitor instance drives the GPIO pins"""
+    global instance_lock_fd
+    
+    instance_lock_fd = os.open(INSTANCE_LOCK_FILE, os.O_CREAT | os.O_RDWR, 0o644)
     try:
-        result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
-        lines = result.stdout.split('\n')
-        
-        current_pid = os.getpid()
-        for line in lines:
-            if 'python' in line.lower() and str(current_pid) not in line:
-                parts = line.split()
-                if len(parts) > 1:
-                    try:
-                        pid = int(parts[1])
-                        os.kill(pid, signal.SIGTERM)
-                        print(f"  Killed process {pid}")
-                    except:
-                        pass
-        time.sleep(1)
-    except Exception as e:
-        print(f"  Could not kill processes: {e}")
+        fcntl.flock(instance_lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        print(f"  Another instance is already running (lock held on {INSTANCE_LOCK_FILE})")
+        raise SystemExit(1)
+    
+    os.ftruncate(instance_lock_fd, 0)
+    os.write(instance_lock_fd, f"{os.getpid()}\n".encode())
 
 class MockLED:
     """Mock LED for simulation mode"""
@@ -315,7 +639,7 @@ def init_gpio():
     global yellow_led, led_objects, reset_button
     
     print("\nInitializing GPIO...")
-    kill_other_gpio_processes()
+    acquire_instance_lock()
     atexit.register(cleanup_gpio)
     
     if GPIO_AVAILABLE:
@@ -362,31 +686,36 @@ def init_gpio():
 
 def start_logging_session():
     """Start a new logging session (button press #1)"""
-    global logging_active, session_start_time, session_data, all_masters_in_session
-    global log_file, log_filename
-    
-    if log_file and not log_file.closed:
-        log_file.close()
+    global logging_active, session_start_time, session_start_idx, all_masters_in_session
+    global log_file, log_filename, log_files_dirty, session_start_drops, udp_drops_seen
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_filename = f"swarm_log_{timestamp}.csv"
-    log_file = open(log_filename, 'w')
+    started = datetime.now()
+    timestamp = started.strftime("%Y%m%d_%H%M%S")
     
-    log_file.write(f"# Session started: {datetime.now().isoformat()}\n")
-    log_file.write("timestamp,node_ip,node_name,sensor_value,is_master,master_duration_seconds,session_elapsed_seconds\n")
-    log_file.flush()
+    with log_lock:
+        if log_file and not log_file.closed:
+            log_file.close()
+        
+        log_filename = f"swarm_log_{timestamp}.csv"
+        log_file = open(log_filename, 'w', buffering=1 << 16)
+        
+        log_file.write(f"# Session started: {started.isoformat()}\n")
+        log_file.write("timestamp,node_ip,node_name,sensor_value,is_master,master_duration_seconds,session_elapsed_seconds\n")
+        log_file.flush()
     
     logging_active = True
-    session_start_time = time.time()
-    session_data.clear()
+    log_files_dirty = True
+    session_start_time = started.timestamp()
+    session_start_idx = graph_ring.head
     all_masters_in_session = set()
+    session_start_drops = udp_drops_seen = read_udp_drops()
     
     # Reset master durations
     for ip in ip_led_map:
         master_duration_data[ip] = 0.0
     
     # Clear unified graph data for web server
-    graph_data_unified.clear()
+    graph_ring.clear()
     print("Graph data cleared for new session")
     
     # Clear LED matrix for new session
@@ -398,37 +727,41 @@ def start_logging_session():
             pass
     
     try:
-        requests.post(WEB_SERVER_ENDPOINT, json={'button_action': 'start'}, timeout=1)
+        _http.post(WEB_SERVER_ENDPOINT, json={'button_action': 'start'}, timeout=1)
     except:
         pass
     
     print("\n" + "="*60)
     print("LOGGING SESSION STARTED")
     print(f"File: {log_filename}")
-    print(f"Start: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Start: {started.strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*60 + "\n")
 
 def stop_logging_session():
     """Stop current logging session (button press #2)"""
-    global logging_active, log_file
+    global logging_active, log_file, log_files_dirty
     
     if not logging_active:
         return
     
     session_duration = time.time() - session_start_time if session_start_time else 0
     
-    if log_file and not log_file.closed:
-        log_file.write(f"\n# Session ended: {datetime.now().isoformat()}\n")
-        log_file.write(f"# Total session duration: {session_duration:.2f} seconds\n")
-        log_file.write(f"\n# MASTER SUMMARY (Devices that became MASTER):\n")
-        log_file.write("# IP Address,Name,Total Duration (seconds)\n")
+    with log_lock:
+        # Write rows still queued for the logger thread before the summary
+        drain_log_queue()
         
-        for ip in sorted(all_masters_in_session):
-            name = ip_led_map[ip][0] if ip in ip_led_map else "UNKNOWN"
-            duration = master_duration_data.get(ip, 0.0)
-            log_file.write(f"# {ip},{name},{duration:.2f}\n")
-        
-        log_file.close()
+        if log_file and not log_file.closed:
+            log_file.write(f"\n# Session ended: {datetime.now().isoformat()}\n")
+            log_file.write(f"# Total session duration: {session_duration:.2f} seconds\n")
+            log_file.write(f"\n# MASTER SUMMARY (Devices that became MASTER):\n")
+            log_file.write("# IP Address,Name,Total Duration (seconds)\n")
+            
+            for ip in sorted(all_masters_in_session):
+                name = ip_led_map[ip][0] if ip in ip_led_map else "UNKNOWN"
+                duration = master_duration_data.get(ip, 0.0)
+                log_file.write(f"# {ip},{name},{duration:.2f}\n")
+            
+            log_file.close()
     
     # Clear LED matrix
     if MATRIX_ENABLED and matrix_device:
@@ -439,7 +772,7 @@ def stop_logging_session():
             pass
     
     try:
-        requests.post(WEB_SERVER_ENDPOINT, json={'button_action': 'stop'}, timeout=1)
+        _http.post(WEB_SERVER_ENDPOINT, json={'button_action': 'stop'}, timeout=1)
     except:
         pass
     
@@ -447,6 +780,9 @@ def stop_logging_session():
     print("LOGGING SESSION STOPPED")
     print(f"File: {log_filename}")
     print(f"Duration: {session_duration:.2f} seconds")
+    drops = read_udp_drops()
+    if drops is not None and session_start_drops is not None and drops > session_start_drops:
+        print(f"⚠ Kernel dropped {drops - session_start_drops} UDP datagrams during this session")
     print(f"Masters: {len(all_masters_in_session)}")
     for ip in sorted(all_masters_in_session):
         name = ip_led_map[ip][0]
@@ -455,20 +791,30 @@ def stop_logging_session():
     print("="*60 + "\n")
     
     logging_active = False
+    log_files_dirty = True
 
-def log_data_point(ip, value, is_master):
-    """Log a single data point during active session"""
+def log_data_point(ip, value, is_master, now):
+    """Log a single data point received at epoch time `now` during active session"""
+    global log_writes_since_flush, log_last_flush
+    
     if not logging_active or not log_file or log_file.closed:
         return
     
     try:
-        timestamp = datetime.now().isoformat()
-        name = ip_led_map[ip][0] if ip in ip_led_map else "UNKNOWN"
-        session_elapsed = time.time() - session_start_time if session_start_time else 0
+        timestamp = datetime.fromtimestamp(now).isoformat()
+        name = node_names.get(ip, "UNKNOWN")
+        session_elapsed = now - session_start_time if session_start_time else 0
         master_duration = master_duration_data.get(ip, 0.0)
         
         log_file.write(f"{timestamp},{ip},{name},{value},{is_master},{master_duration:.2f},{session_elapsed:.2f}\n")
-        log_file.flush()
+        
+        # Let the buffered writer coalesce rows; flush periodically, not per packet
+        log_writes_since_flush += 1
+        flush_clock = time.monotonic()
+        if log_writes_since_flush >= LOG_FLUSH_EVERY or flush_clock - log_last_flush > LOG_FLUSH_INTERVAL:
+            log_file.flush()
+            log_writes_since_flush = 0
+            log_last_flush = flush_clock
         
         if is_master:
             all_masters_in_session.add(ip)
@@ -476,9 +822,44 @@ def log_data_point(ip, value, is_master):
     except Exception as e:
         print(f"Log error: {e}")
 
+def drain_log_queue():
+    """Write every queued row now (caller holds log_lock)"""
+    while True:
+        try:
+            row = log_queue.get_nowait()
+        except queue.Empty:
+            return
+        log_data_point(*row)
+
+def log_writer_loop():
+    """Write queued session rows to the log file in batches"""
+    global log_writes_since_flush, log_last_flush
+    
+    while not shutdown_flag.is_set():
+        try:
+            batch = [log_queue.get(timeout=0.5)]
+        except queue.Empty:
+            # Idle: push out rows still sitting in the file buffer
+            with log_lock:
+                if log_writes_since_flush and log_file and not log_file.closed:
+                    log_file.flush()
+                    log_writes_since_flush = 0
+                    log_last_flush = time.monotonic()
+            continue
+        
+        while len(batch) < LOG_BATCH_SIZE:
+            try:
+                batch.append(log_queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        with log_lock:
+            for row in batch:
+                log_data_point(*row)
+
 def button_pressed():
     """Handle button press - toggle logging on/off"""
-    global logging_active
+    global logging_active, yellow_off_event
     
     try:
         yellow_led.on()
@@ -496,7 +877,14 @@ def button_pressed():
         except:
             pass
     
-    threading.Timer(3.0, turn_off_yellow).start()
+    # Restart the 3 s countdown if a previous press is still pending
+    try:
+        if yellow_off_event is not None:
+            scheduler.cancel(yellow_off_event)
+    except ValueError:
+        pass
+    yellow_off_event = scheduler.enter(3.0, 1, turn_off_yellow)
+    scheduler_wakeup.set()
 
 # ============================================================================
 # DATA MANAGEMENT FUNCTIONS
@@ -504,16 +892,17 @@ def button_pressed():
 
 def cleanup_old_data():
     """Remove data older than TIME_WINDOW seconds"""
-    global graph_data_unified
-    
+    global state_dirty
     if graph_start_time is None:
         return
     
     current_time = time.time()
     cutoff_time = current_time - TIME_WINDOW
     
-    while graph_data_unified and graph_data_unified[0]['timestamp'] < cutoff_time:
-        graph_data_unified.popleft()
+    tail = graph_ring.tail
+    graph_ring.discard_before(cutoff_time)
+    if graph_ring.tail != tail:
+        state_dirty = True
 
 def update_master_duration():
     """Calculate how long each node has been master"""
@@ -522,27 +911,43 @@ def update_master_duration():
     if not logging_active or session_start_time is None:
         return
     
-    current_time = time.time()
-    cutoff_time = session_start_time
+    # The session shares graph_ring with the graphs, starting at session_start_idx
+    ts, ip_idx, _, is_master = graph_ring.window(session_start_idx)
+    durations = master_durations_in_window(ts, ip_idx, is_master, time.time())
     
     for ip in ip_led_map:
-        master_duration_data[ip] = 0.0
-    
-    last_master = None
-    last_time = None
+        master_duration_data[ip] = float(durations[ip_to_idx[ip]])
+
+# Master-only view of graph_ring, rebuilt only when new samples arrive
+_matrix_cache_head = -1
+_matrix_master_ts = np.zeros(0)
+_matrix_master_ip = np.zeros(0, dtype=np.uint8)
+_matrix_cumulative = np.zeros((len(device_ips), 0))
+
+def _refresh_matrix_cache():
+    """Rebuild per-device cumulative master time from the current ring state"""
+    global _matrix_cache_head, _matrix_master_ts, _matrix_master_ip, _matrix_cumulative
     
-    for point in session_data:
-        if point['timestamp'] >= cutoff_time:
-            if point['is_master']:
-                if last_master == point['ip'] and last_time is not None:
-                    duration = point['timestamp'] - last_time
-                    master_duration_data[point['ip']] += duration
-                last_master = point['ip']
-                last_time = point['timestamp']
+    head = graph_ring.head
+    if head == _matrix_cache_head:
+        return
     
-    if last_master is not None and last_time is not None:
-        duration = current_time - last_time
-        master_duration_data[last_master] += duration
+    ts, ip_idx, _, is_master = graph_ring.window()
+    master_ts = ts[is_master]
+    master_ip = ip_idx[is_master]
+    
+    # cumulative[d, j]: time device d held master between master samples 0..j
+    contrib = np.zeros((len(device_ips), master_ts.size))
+    if master_ts.size > 1:
+        same = master_ip[1:] == master_ip[:-1]
+        rows = master_ip[1:][same]
+        cols = np.nonzero(same)[0] + 1
+        contrib[rows, cols] = np.diff(master_ts)[same]
+    
+    _matrix_master_ts = master_ts
+    _matrix_master_ip = master_ip
+    _matrix_cumulative = np.cumsum(contrib, axis=1)
+    _matrix_cache_head = head
 
 def calculate_matrix_graph():
     """Calculate LED pattern for MASTER DURATION BAR CHART"""
@@ -550,67 +955,44 @@ def calculate_matrix_graph():
     cutoff_time = current_time - GRAPH_TIME_WINDOW
     device_row_data = {}
     
-    ip_to_device_idx = {}
-    for idx, ip in enumerate(sorted(ip_led_map.keys())):
-        ip_to_device_idx[ip] = idx
-    
-    master_durations = {}
-    for ip in ip_led_map:
-        master_durations[ip] = 0.0
-    
-    last_master_ip = None
-    last_time = None
+    _refresh_matrix_cache()
+    master_ts = _matrix_master_ts
+    master_durations = np.zeros(len(device_ips))
     
-    for point in graph_data_unified:
-        if point['timestamp'] >= cutoff_time:
-            if point['is_master']:
-                if last_master_ip == point['ip'] and last_time is not None:
-                    duration = point['timestamp'] - last_time
-                    master_durations[point['ip']] += duration
-                
-                last_master_ip = point['ip']
-                last_time = point['timestamp']
+    if len(graph_ring) and master_ts.size:
+        # Samples discarded by cleanup_old_data must not count either
+        oldest = graph_ring.ts[graph_ring.tail % graph_ring.capacity]
+        start = int(np.searchsorted(master_ts, max(cutoff_time, oldest)))
+        if start < master_ts.size:
+            master_durations = _matrix_cumulative[:, -1] - _matrix_cumulative[:, start]
+            master_durations[_matrix_master_ip[-1]] += current_time - master_ts[-1]
     
-    if last_master_ip is not None and last_time is not None:
-        duration = current_time - last_time
-        master_durations[last_master_ip] += duration
+    rows_to_light = np.minimum((master_durations / ROW_TIME).astype(int), NUM_ROWS)
     
     for ip in ip_led_map:
-        device_idx = ip_to_device_idx[ip]
-        row_values = [0] * NUM_ROWS
-        
-        duration_seconds = master_durations[ip]
-        rows_to_light = int(duration_seconds / ROW_TIME)
-        rows_to_light = min(rows_to_light, NUM_ROWS)
-        
-        for row in range(NUM_ROWS):
-            if row >= (NUM_ROWS - rows_to_light):
-                row_values[row] = 2
-            else:
-                row_values[row] = 0
-        
-        device_row_data[device_idx] = row_values
+        device_idx = ip_to_idx[ip]
+        lit = int(rows_to_light[device_idx])
+        device_row_data[device_idx] = [0] * (NUM_ROWS - lit) + [2] * lit
     
     return device_row_data
 
 def get_log_files_list():
     """Get list of all log files in current directory"""
     try:
-        script_dir = os.path.dirname(os.path.abspath(__file__))
         log_files = []
         
-        for filename in os.listdir(script_dir):
-            if filename.startswith('swarm_log_') and filename.endswith('.csv'):
-                filepath = os.path.join(script_dir, filename)
-                try:
-                    stat = os.stat(filepath)
-                    log_files.append({
-                        'name': filename,
-                        'size': stat.st_size,
-                        'modified': stat.st_mtime
-                    })
-                except:
-                    pass
+        with os.scandir(SCRIPT_DIR) as entries:
+            for entry in entries:
+                if entry.name.startswith('swarm_log_') and entry.name.endswith('.csv'):
+                    try:
+                        stat = entry.stat()
+                        log_files.append({
+                            'name': entry.name,
+                            'size': stat.st_size,
+                            'modified': stat.st_mtime
+                        })
+                    except:
+                        pass
         
         log_files.sort(key=lambda x: x['modified'], reverse=True)
         return log_files
@@ -619,22 +1001,25 @@ def get_log_files_list():
 
 def send_to_web_server():
     """Send current state to web server"""
-    global last_log_files_sent
+    global last_log_files_sent, log_files_dirty, log_files_scanned_at
     
     try:
         current_time = time.time()
         cutoff_time = current_time - TIME_WINDOW
         
+        ts, ip_idx, value, is_master = graph_ring.window()
+        recent = slice(int(np.searchsorted(ts, cutoff_time)), None)
         recent_data = [
             {
-                'timestamp': point['timestamp'],
-                'ip': point['ip'],
-                'name': ip_led_map[point['ip']][0],
-                'value': point['value'],
-                'is_master': point['is_master']
+                'timestamp': timestamp,
+                'ip': device_ips[idx],
+                'name': node_names[device_ips[idx]],
+                'value': val,
+                'is_master': master
             }
-            for point in graph_data_unified
-            if point['timestamp'] >= cutoff_time
+            for timestamp, idx, val, master in zip(
+                ts[recent].tolist(), ip_idx[recent].tolist(),
+                value[recent].tolist(), is_master[recent].tolist())
         ]
         
         current_master = None
@@ -642,21 +1027,23 @@ def send_to_web_server():
             if node_is_master[ip]:
                 current_master = {
                     'ip': ip,
-                    'name': ip_led_map[ip][0],
+                    'name': node_names[ip],
                     'value': node_values[ip]
                 }
                 break
         
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        # Get current log files
-        current_log_files = get_log_files_list()
+        # Rescan log files only after a session change or when the cache is stale
+        now = time.monotonic()
+        if log_files_dirty or now - log_files_scanned_at > LOG_FILES_REFRESH_INTERVAL:
+            last_log_files_sent = get_log_files_list()
+            log_files_dirty = False
+            log_files_scanned_at = now
         
         payload = {
             'timestamp': current_time,
             'nodes': {
                 ip: {
-                    'name': ip_led_map[ip][0],
+                    'name': node_names[ip],
                     'value': node_values[ip],
                     'is_master': node_is_master[ip],
                     'last_update': last_update_time[ip]
@@ -666,19 +1053,17 @@ def send_to_web_server():
             'current_master': current_master,
             'graph_data': recent_data,
             'master_durations': {
-                ip_led_map[ip][0]: master_duration_data[ip]
+                node_names[ip]: master_duration_data[ip]
                 for ip in ip_led_map
             },
             'logging_active': logging_active,
             'session_start': session_start_time,
-            'log_directory': script_dir,
+            'log_directory': SCRIPT_DIR,
             'current_log_file': log_filename if logging_active else None,
-            'log_files': current_log_files  # Send log files list
+            'log_files': last_log_files_sent  # Send log files list
         }
         
-        last_log_files_sent = current_log_files
-        
-        requests.post(WEB_SERVER_ENDPOINT, json=payload, timeout=1)
+        _http.post(WEB_SERVER_ENDPOINT, data=dumps_json(payload), timeout=1)
             
     except:
         pass
@@ -690,17 +1075,21 @@ def send_to_web_server():
 
 def web_server_update_loop():
     """Continuously send updates to web server"""
+    global state_dirty
     print("✓ Web server update thread started")
+    last_post = 0.0
     
-    while not shutdown_flag.is_set():
+    while not shutdown_flag.wait(0.5):
         try:
-            update_master_duration()
-            send_to_web_server()
-            time.sleep(0.5)
+            now = time.monotonic()
+            if state_dirty or log_files_dirty or now - last_post >= WEB_HEARTBEAT_INTERVAL:
+                state_dirty = False
+                update_master_duration()
+                send_to_web_server()
+                last_post = now
         except Exception as e:
             if not shutdown_flag.is_set():
                 print(f"Web update error: {e}")
-            time.sleep(1)
 
 def matrix_update_thread():
     """Thread to update LED matrix with time-series graph"""
@@ -713,12 +1102,13 @@ def matrix_update_thread():
     consecutive_errors = 0
     max_consecutive_errors = 5
     
-    while not shutdown_flag.is_set():
+    delay = 0
+    while not shutdown_flag.wait(delay):
         try:
             device_row_data = calculate_matrix_graph()
             matrix_device.display_row_graph(device_row_data)
             consecutive_errors = 0
-            time.sleep(0.5)
+            delay = 0.5
             
         except Exception as e:
             consecutive_errors += 1
@@ -730,7 +1120,7 @@ def matrix_update_thread():
                 print(f"Matrix stopped after {max_consecutive_errors} consecutive errors")
                 break
             
-            time.sleep(1)
+            delay = 1
     
     print("Matrix update thread stopped")
 
@@ -743,120 +1133,221 @@ def stop_all_leds():
     except:
         pass
 
+# Message prefixes compared against raw datagram bytes (no per-packet decode)
+_MASTER_PREFIX = b"MASTER:"
+_SENSOR_PREFIX = b"SENSOR:"
+_LIGHT_PREFIX = b"LIGHT:"
+_PREFIXES = ((_MASTER_PREFIX, True), (_SENSOR_PREFIX, False), (_LIGHT_PREFIX, False))
+
+def parse_packet(data):
+    """Return (value, is_master) for a swarm message, or None for other traffic.
+    
+    Raises ValueError if the value is not an integer.
+    """
+    for prefix, is_master in _PREFIXES:
+        if data[:len(prefix)] == prefix:
+            return int(data[len(prefix):]), is_master
+    return None
+
+def handle_packet(data, sender_ip, current_time):
+    """Parse one datagram from an ESP32 node, received at epoch time current_time"""
+    if sender_ip not in ip_led_map:
+        return
+    
+    try:
+        parsed = parse_packet(data)
+    except ValueError as e:
+        print(f"Parse error: {bytes(data).decode('utf-8', 'replace')} - {e}")
+        return
+    
+    if parsed is not None:
+        apply_sample(sender_ip, parsed[0], parsed[1], current_time)
+
+def apply_sample(sender_ip, value, is_master, current_time):
+    """Update swarm state with one parsed reading from a known node"""
+    global graph_start_time, current_master_ip, state_dirty
+    
+    if graph_start_time is None:
+        graph_start_time = current_time
+        print(f"\n{'='*60}")
+        print("Data collection started")
+        print(f"{'='*60}\n")
+    
+    node_values[sender_ip] = value
+    node_is_master[sender_ip] = is_master
+    last_update_time[sender_ip] = current_time
+    
+    if is_master:
+        # Only the previous and the new master change state
+        if current_master_ip != sender_ip:
+            previous_master = current_master_ip
+            current_master_ip = sender_ip
+            if previous_master is not None:
+                node_is_master[previous_master] = False
+            try:
+                if previous_master is not None:
+                    led_objects[previous_master].off()
+                led_objects[sender_ip].on()
+            except:
+                pass
+    
+    graph_ring.append(current_time, ip_to_idx[sender_ip], value, is_master)
+    state_dirty = True
+    
+    if logging_active:
+        log_queue.put((sender_ip, value, is_master, current_time))
+    
+    if is_master:
+        node_name = node_names[sender_ip]
+        status = "📝" if logging_active else "  "
+        print(f"{status} ★ [MASTER] {node_name:6s} ({sender_ip}): {value:4d}")
+
 def udp_listener():
     """Listen for UDP messages from ESP32 nodes"""
-    global graph_start_time, session_start_time
+    receiver = BatchReceiver(recv_sock)
     
     print(f"UDP listener started on port {UDP_PORT}")
     print(f"Listening for: {list(ip_led_map.keys())}")
+    if receiver.batched:
+        print(f"recvmmsg batching enabled ({UDP_BATCH_SIZE} datagrams/call)")
+    else:
+        print("recvmmsg not available - using recvfrom")
     recv_sock.settimeout(1.0)
     
     while not shutdown_flag.is_set():
         try:
-            data, addr = recv_sock.recvfrom(1024)
-            msg = data.decode('utf-8').strip()
-            sender_ip = addr[0]
-            
-            if sender_ip not in ip_led_map:
+            ready, _, _ = select.select([recv_sock], [], [], 1.0)
+            if not ready:
                 continue
             
-            current_time = time.time()
+            packets = receiver.receive()
             
-            if graph_start_time is None:
-                graph_start_time = current_time
-                print(f"\n{'='*60}")
-                print("Data collection started")
-                print(f"{'='*60}\n")
+            # One clock read per batch; all datagrams in it were queued together
+            now = time.time()
+            for data, sender_ip in packets:
+                handle_packet(data, sender_ip, now)
+        
+        except socket.timeout:
+            continue
+        except Exception as e:
+            if not shutdown_flag.is_set():
+                print(f"UDP listener error: {e}")
+            if shutdown_flag.wait(0.1):
+                break
+    
+    print("UDP listener stopped")
+
+def receiver_process_main(sock, sample_queue, stop_event):
+    """Receive and parse datagrams in a child process, queueing parsed batches"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    receiver = BatchReceiver(sock)
+    
+    while not stop_event.is_set():
+        try:
+            ready, _, _ = select.select([sock], [], [], 1.0)
+            if not ready:
+                continue
             
-            if msg.startswith("MASTER:"):
+            packets = receiver.receive()
+            now = time.time()
+            batch = []
+            for data, sender_ip in packets:
+                if sender_ip not in ip_led_map:
+                    continue
                 try:
-                    value = int(msg.split(":")[1])
-                    
-                    node_values[sender_ip] = value
-                    node_is_master[sender_ip] = True
-                    last_update_time[sender_ip] = current_time
-                    
-                    for ip in ip_led_map:
-                        if ip != sender_ip:
-                            node_is_master[ip] = False
-                    
-                    try:
-                        led_objects[sender_ip].on()
-                        for ip in ip_led_map:
-                            if ip != sender_ip:
-                                led_objects[ip].off()
-                    except:
-                        pass
-                    
-                    graph_data_unified.append({
-                        'timestamp': current_time,
-                        'ip': sender_ip,
-                        'value': value,
-                        'is_master': True
-                    })
-                    
-                    if logging_active:
-                        session_data.append({
-                            'timestamp': current_time,
-                            'ip': sender_ip,
-                            'value': value,
-                            'is_master': True
-                        })
-                        log_data_point(sender_ip, value, True)
-                    
-                    node_name = ip_led_map[sender_ip][0]
-                    status = "📝" if logging_active else "  "
-                    print(f"{status} ★ [MASTER] {node_name:6s} ({sender_ip}): {value:4d}")
-                    
-                except (ValueError, IndexError) as e:
-                    print(f"Parse error: {msg} - {e}")
+                    parsed = parse_packet(data)
+                except ValueError as e:
+                    print(f"Parse error: {bytes(data).decode('utf-8', 'replace')} - {e}")
+                    continue
+                if parsed is not None:
+                    batch.append((sender_ip, parsed[0], parsed[1], now))
             
-            elif msg.startswith("SENSOR:") or msg.startswith("LIGHT:"):
-                try:
-                    value = int(msg.split(":")[1])
-                    
-                    node_values[sender_ip] = value
-                    node_is_master[sender_ip] = False
-                    last_update_time[sender_ip] = current_time
-                    
-                    graph_data_unified.append({
-                        'timestamp': current_time,
-                        'ip': sender_ip,
-                        'value': value,
-                        'is_master': False
-                    })
-                    
-                    if logging_active:
-                        session_data.append({
-                            'timestamp': current_time,
-                            'ip': sender_ip,
-                            'value': value,
-                            'is_master': False
-                        })
-                        log_data_point(sender_ip, value, False)
-                    
-                except (ValueError, IndexError) as e:
-                    print(f"Parse error: {msg} - {e}")
+            if batch:
+                sample_queue.put(batch)
         
         except socket.timeout:
             continue
         except Exception as e:
-            if not shutdown_flag.is_set():
-                print(f"UDP listener error: {e}")
+            if not stop_event.is_set():
+                print(f"UDP receiver process error: {e}")
             time.sleep(0.1)
+
+def start_receiver_process():
+    """Fork the UDP receiver process and return (process, queue, stop_event)"""
+    ctx = multiprocessing.get_context("fork")
+    sample_queue = ctx.Queue()
+    stop_event = ctx.Event()
+    process = ctx.Process(target=receiver_process_main,
+                          args=(recv_sock, sample_queue, stop_event),
+                          name="udp-receiver", daemon=True)
+    process.start()
+    
+    print(f"UDP receiver process started on port {UDP_PORT} (pid {process.pid})")
+    print(f"Listening for: {list(ip_led_map.keys())}")
+    return process, sample_queue, stop_event
+
+def receiver_queue_listener(sample_queue):
+    """Apply sample batches parsed by the UDP receiver process"""
+    while not shutdown_flag.is_set():
+        try:
+            batch = sample_queue.get(timeout=1.0)
+        except queue.Empty:
+            continue
+        except (EOFError, OSError):
+            break
+        
+        for sender_ip, value, is_master, now in batch:
+            try:
+                apply_sample(sender_ip, value, is_master, now)
+            except Exception as e:
+                print(f"UDP sample error: {e}")
     
-    print("UDP listener stopped")
+    print("UDP queue listener stopped")
 
-def cleanup_loop():
-    """Periodically clean up old data"""
+def scheduler_loop():
+    """Run delayed callbacks queued on the shared scheduler"""
     while not shutdown_flag.is_set():
+        try:
+            scheduler.run()
+        except Exception as e:
+            print(f"Scheduler error: {e}")
+        scheduler_wakeup.wait(1.0)
+        scheduler_wakeup.clear()
+
+def check_udp_drops():
+    """Warn when the kernel has dropped datagrams since the last check"""
+    global udp_drops_seen
+    
+    drops = read_udp_drops()
+    if drops is None:
+        return
+    if udp_drops_seen is not None and drops > udp_drops_seen:
+        print(f"⚠ Kernel dropped {drops - udp_drops_seen} UDP datagrams "
+              f"(receive buffer overrun) - consider a larger SOCKET_BUFFER_SIZE")
+    udp_drops_seen = drops
+
+def next_cleanup_delay():
+    """Seconds until the oldest graph sample leaves the TIME_WINDOW (at most 1 s)"""
+    oldest = graph_ring.oldest()
+    if oldest is None:
+        return 1.0
+    return min(1.0, max(0.05, oldest + TIME_WINDOW - time.time()))
+
+def cleanup_loop():
+    """Drop graph samples as they expire and watch for UDP drops"""
+    last_drop_check = time.monotonic()
+    
+    while not shutdown_flag.wait(next_cleanup_delay()):
         try:
             cleanup_old_data()
-            time.sleep(1)
+            
+            now = time.monotonic()
+            if logging_active and now - last_drop_check >= UDP_DROP_CHECK_INTERVAL:
+                check_udp_drops()
+                last_drop_check = now
         except Exception as e:
             if not shutdown_flag.is_set():
                 print(f"Cleanup error: {e}")
-            time.sleep(1)
 
 # ============================================================================
 # MAIN EXECUTION
@@ -864,46 +1355,69 @@ def cleanup_loop():
 
 def print_startup_banner():
     """Print startup information"""
-    print("\n" + "="*60)
-    print("  RASPBERRY PI LIGHT SWARM MONITOR")
-    print("  BUTTON-BASED SESSION LOGGING + LED MATRIX")
-    print("="*60)
-    print(f"\n  Network Configuration:")
-    print(f"   Local IP:     {LOCAL_IP}")
-    print(f"   UDP Port:     {UDP_PORT}")
-    print(f"   Broadcast:    {BROADCAST_IP}")
-    print(f"\n Web Server:")
-    print(f"   URL: {WEB_SERVER_URL}")
-    print(f"\n Monitoring Nodes:")
+    lines = []
+    lines.append("\n" + "="*60)
+    lines.append("  RASPBERRY PI LIGHT SWARM MONITOR")
+    lines.append("  BUTTON-BASED SESSION LOGGING + LED MATRIX")
+    lines.append("="*60)
+    lines.append(f"\n  Network Configuration:")
+    lines.append(f"   Local IP:     {LOCAL_IP}")
+    lines.append(f"   UDP Port:     {UDP_PORT}")
+    lines.append(f"   Broadcast:    {BROADCAST_IP}")
+    # Linux reports double the requested size to account for bookkeeping overhead
+    rcvbuf = recv_sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) // 2
+    lines.append(f"   Recv Buffer:  {rcvbuf // 1024} KB")
+    if rcvbuf < SOCKET_BUFFER_SIZE:
+        lines.append(f"   ⚠ Requested {SOCKET_BUFFER_SIZE // 1024} KB - raise net.core.rmem_max")
+    drops = read_udp_drops()
+    if drops is not None:
+        lines.append(f"   UDP Drops:    {drops} (kernel counter)")
+    lines.append(f"\n Web Server:")
+    lines.append(f"   URL: {WEB_SERVER_URL}")
+    lines.append(f"\n Monitoring Nodes:")
     for ip, (name, pin) in ip_led_map.items():
-        print(f"   {name:6s} - {ip:15s} (GPIO {pin})")
-    print(f"\n Button Configuration:")
-    print(f"   Button Pin:   GPIO {BUTTON_PIN}")
-    print(f"   Yellow LED:   GPIO {YELLOW_LED_PIN}")
-    print(f"\n Logging System:")
-    print(f"   Press button once:  START logging (creates new file)")
-    print(f"   Press button again: STOP logging (saves with summary)")
-    print(f"\n LED Matrix:")
+        lines.append(f"   {name:6s} - {ip:15s} (GPIO {pin})")
+    lines.append(f"\n Button Configuration:")
+    lines.append(f"   Button Pin:   GPIO {BUTTON_PIN}")
+    lines.append(f"   Yellow LED:   GPIO {YELLOW_LED_PIN}")
+    lines.append(f"\n Logging System:")
+    lines.append(f"   Press button once:  START logging (creates new file)")
+    lines.append(f"   Press button again: STOP logging (saves with summary)")
+    lines.append(f"\n LED Matrix:")
     matrix_status = "✓ Enabled" if MATRIX_ENABLED else "⚠ Disabled"
-    print(f"   Status: {matrix_status}")
+    lines.append(f"   Status: {matrix_status}")
     if MATRIX_ENABLED:
-        print(f"   Display: {NUM_ROWS} rows × {ROW_TIME:.2f}s = {GRAPH_TIME_WINDOW}s per device")
-        print(f"   Shows: Master duration bar chart")
-    print(f"\n Log File Contains:")
-    print(f"   • All devices that became masters (IP addresses)")
-    print(f"   • How long each device was master (from beginning)")
-    print(f"   • Raw data from each master")
-    print(f"   • Session summary at end of file")
-    print("\n" + "="*60 + "\n")
+        lines.append(f"   Display: {NUM_ROWS} rows × {ROW_TIME:.2f}s = {GRAPH_TIME_WINDOW}s per device")
+        lines.append(f"   Shows: Master duration bar chart")
+    lines.append(f"\n Log File Contains:")
+    lines.append(f"   • All devices that became masters (IP addresses)")
+    lines.append(f"   • How long each device was master (from beginning)")
+    lines.append(f"   • Raw data from each master")
+    lines.append(f"   • Session summary at end of file")
+    lines.append("\n" + "="*60 + "\n")
+    
+    # One write for the whole banner instead of a print() per line
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 def shutdown_handler():
     """Handle clean shutdown"""
-    print("\n" + "="*60)
-    print(" SHUTTING DOWN...")
-    print("="*60)
+    sys.stdout.write("\n" + "="*60 + "\n SHUTTING DOWN...\n" + "="*60 + "\n")
+    sys.stdout.flush()
     
     shutdown_flag.set()
-    time.sleep(1)
+    scheduler_wakeup.set()
+    
+    if receiver_process is not None:
+        receiver_stop_event.set()
+        receiver_process.join(timeout=2.0)
+        if receiver_process.is_alive():
+            receiver_process.terminate()
+    
+    # Worker loops wait on shutdown_flag, so they exit as soon as their
+    # current iteration (at most one select() timeout) finishes
+    for thread in worker_threads:
+        thread.join(timeout=2.0)
     
     if logging_active:
         stop_logging_session()
@@ -926,8 +1440,8 @@ def shutdown_handler():
         except:
             pass
     
-    print("Cleanup complete")
-    print("="*60 + "\n")
+    sys.stdout.write("Cleanup complete\n" + "="*60 + "\n\n")
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     try:
@@ -956,22 +1470,41 @@ if __name__ == "__main__":
         except:
             pass
         
-        # Start UDP listener thread
-        udp_thread = threading.Thread(target=udp_listener, daemon=True)
+        # Start UDP listener (in a separate process if configured)
+        if UDP_RECEIVER_PROCESS:
+            receiver_process, receiver_queue, receiver_stop_event = start_receiver_process()
+            udp_thread = threading.Thread(target=receiver_queue_listener,
+                                          args=(receiver_queue,), daemon=True)
+        else:
+            udp_thread = threading.Thread(target=udp_listener, daemon=True)
         udp_thread.start()
+        worker_threads.append(udp_thread)
         
         # Start web server update thread
         web_thread = threading.Thread(target=web_server_update_loop, daemon=True)
         web_thread.start()
+        worker_threads.append(web_thread)
         
         # Start data cleanup thread
         cleanup_thread = threading.Thread(target=cleanup_loop, daemon=True)
         cleanup_thread.start()
+        worker_threads.append(cleanup_thread)
+        
+        # Start session logger thread
+        log_thread = threading.Thread(target=log_writer_loop, daemon=True)
+        log_thread.start()
+        worker_threads.append(log_thread)
+        
+        # Start scheduler thread for delayed callbacks
+        scheduler_thread = threading.Thread(target=scheduler_loop, daemon=True)
+        scheduler_thread.start()
+        worker_threads.append(scheduler_thread)
         
         # Start LED Matrix update thread (if available)
         if MATRIX_ENABLED and matrix_device:
             matrix_thread = threading.Thread(target=matrix_update_thread, daemon=True)
             matrix_thread.start()
+            worker_threads.append(matrix_thread)
             print("LED Matrix Graph thread started")
         else:
             print("LED Matrix thread not started (matrix disabled)")
@@ -990,9 +1523,8 @@ if __name__ == "__main__":
         print("  Press Ctrl+C to stop")
         print("="*60 + "\n")
         
-        # Main loop
-        while True:
-            time.sleep(1)
+        # Main loop - sleep until shutdown is requested
+        shutdown_flag.wait()
         
     except KeyboardInterrupt:
         print("\n\n Keyboard interrupt detected")
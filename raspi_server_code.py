@@ -1,14 +1,102 @@
 
-from flask import Flask, render_template_string, jsonify, request, send_file
-from flask_cors import CORS
+from flask import Flask, Response, request, send_file
 from datetime import datetime
 import threading
 import time
 import os
+import sys
 import csv
+import io
+import json
+import re
+import struct
+import tempfile
+import gzip
+import hashlib
+import numpy as np
+
+# Vectorized log file analysis (falls back to the csv module)
+try:
+    import pandas as pd
+    from dateutil.tz import tzlocal
+    PANDAS_AVAILABLE = True
+except ImportError:
+    print("pandas not available - analyzing log files with the csv module")
+    PANDAS_AVAILABLE = False
+
+# Multithreaded CSV parsing for the pandas log analysis path
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    print("pyarrow not available - log files are parsed single-threaded")
+    PYARROW_AVAILABLE = False
+
+# Fast JSON encoding for API responses
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    print("orjson not available - encoding JSON with the json module")
+    ORJSON_AVAILABLE = False
+
+# Brotli for the precompressed dashboard page (gzip is always available)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    print("brotli not available - serving dashboard with gzip only")
+    BROTLI_AVAILABLE = False
+
+# Minifiers for the dashboard stylesheet and script (run once at import)
+try:
+    import rcssmin
+    import rjsmin
+    MINIFY_AVAILABLE = True
+except ImportError:
+    print("rcssmin/rjsmin not available - serving dashboard assets unminified")
+    MINIFY_AVAILABLE = False
+
+# Production WSGI server (falls back to Flask's development server)
+try:
+    from waitress import serve
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    print("waitress not available - using the Flask development server")
+    WAITRESS_AVAILABLE = False
 
 app = Flask(__name__)
-CORS(app)
+
+# Behind a front-end server that honours X-Sendfile (Apache mod_xsendfile,
+# lighttpd), log downloads only send the header and the front end streams
+# the file from disk itself
+app.config['USE_X_SENDFILE'] = os.environ.get('SWARM_X_SENDFILE') == '1'
+
+def encode_json(obj):
+    """Return obj encoded as JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')  # compact, like orjson
+
+def json_response(obj):
+    """Return obj as a JSON response"""
+    return Response(encode_json(obj), mimetype='application/json')
+
+def request_json():
+    """Return the decoded JSON body of the current request"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(request.get_data(cache=False))
+    return request.get_json()
+
+@app.after_request
+def add_cors_headers(response):
+    """Allow the dashboard API to be called from any origin"""
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    if request.method == 'OPTIONS':
+        response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
+        response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
+    return response
 
 # ============================================================================
 # GLOBAL STATE
@@ -27,32 +115,161 @@ latest_data = {
     'current_log_file': None
 }
 
-data_lock = threading.Lock()
+# latest_data is never mutated in place: writers build a new dict and rebind it
+# under data_lock, so readers can take the reference and serialize it unlocked
+data_lock = threading.Lock()  # Serializes writers of latest_data
+log_lock = threading.Lock()   # Guards the session log file and session tracking
+log_write_lock = threading.Lock()  # Held while a batch is written (taken after log_lock)
+log_rows_ready = threading.Event()  # Set once LOG_BATCH_ROWS rows are queued
+log_session_open = threading.Event()  # Set while a session log is open (read without log_lock)
+
+# Dashboard push stream: writers only bump state_version; the dashboard view is
+# encoded lazily, at most once per version, and the same bytes go to every
+# /api/stream and /api/data client
+state_changed = threading.Condition()
+state_version = 0
+json_lock = threading.Lock()  # Serializes encoding of latest_json
+latest_json = (0, encode_json(latest_data))  # (state_version it was encoded from, bytes)
+state_etag_prefix = format(time.time_ns(), 'x')  # keeps ETags unique across restarts
+STREAM_KEEPALIVE_INTERVAL = 5.0  # seconds between keepalive comments on an idle stream
+GRAPH_POINTS_PER_NODE = 60       # live chart points sent per node (LTTB-downsampled)
+
+# One server process: dashboard state and the session log live in its memory,
+# so scale with threads rather than worker processes
+SERVER_THREADS = 16  # waitress request threads (each open /api/stream holds one)
+MAX_STREAMS = SERVER_THREADS // 2  # open /api/stream clients; the rest poll
+STREAM_MAX_LIFETIME = 300.0  # seconds before a stream ends (EventSource reconnects)
+stream_slots = threading.BoundedSemaphore(MAX_STREAMS)
 
 # Log file management
 local_log_directory = 'webserver_logs'
 os.makedirs(local_log_directory, exist_ok=True)
 rpi_log_files_directory = None
+LOG_FLUSH_INTERVAL = 1.0  # seconds between background flushes of the session log
+LOG_BATCH_ROWS = 256      # rows collected before a writerows() call
+LOG_WRITE_BUFFER = 65536  # file buffer size; a full buffer goes to disk in one write()
+SESSION_BUFFER_CAPACITY = 72_000  # recent points kept in memory (~1 h at 20 Hz)
+LOG_UNBUFFERED = os.environ.get('SWARM_LOG_UNBUFFERED') == '1'  # flush every row (debugging)
+LOG_BINARY = os.environ.get('SWARM_LOG_BINARY') == '1'  # record rows in binary, export CSV at stop
+LOG_FILENAME_RE = re.compile(r'swarm_log_[A-Za-z0-9_-]+\.(csv|summary\.txt)')  # a log or its summary
+LOG_LIST_MAX_AGE = 2.0  # seconds an unchanged /api/logs/all listing is reused
+_log_list_cache = (None, 0.0, b'')  # (directory key, expiry, encoded listing)
+
+# Binary session log records (LOG_BINARY). A node record maps an IP index to
+# "ip,name" the first time the IP is seen; each point is one fixed-size record.
+_NODE_RECORD = struct.Struct('<cBH')        # b'N', ip_idx, length of "ip,name"
+_POINT_RECORD = struct.Struct('<cdBi?dd')   # b'P', ts, ip_idx, value, is_master, master_duration, elapsed
+
+class SessionBuffer:
+    """Struct-of-arrays ring of the most recent data points logged in a session.
+    
+    Points are kept in preallocated parallel numpy arrays; once full, the
+    oldest slots are overwritten. IPs are mapped to small indices and their
+    interned IP and name strings are recorded once per session. A set of
+    (timestamp, IP index) keys mirrors the ring for constant-time lookups.
+    """
+    
+    def __init__(self, capacity=SESSION_BUFFER_CAPACITY):
+        self.capacity = capacity
+        self.ts = np.empty(capacity, dtype=np.float64)
+        self.ip_idx = np.empty(capacity, dtype=np.int8)
+        self.value = np.empty(capacity, dtype=np.int16)
+        self.is_master = np.empty(capacity, dtype=np.bool_)
+        self.count = 0  # total points appended this session
+        self.ip_table = []   # index -> ip
+        self.ip_index = {}   # ip -> index
+        self.names = []      # index -> name (first seen)
+        self.keys = set()    # (timestamp, ip index) of every point held
+    
+    def __len__(self):
+        return min(self.count, self.capacity)
+    
+    def index_for(self, ip, name):
+        """Return the small index for ip, registering it on first sight"""
+        idx = self.ip_index.get(ip)
+        if idx is None:
+            idx = len(self.ip_table)
+            ip = sys.intern(ip)
+            self.ip_index[ip] = idx
+            self.ip_table.append(ip)
+            self.names.append(sys.intern(name))
+        return idx
+    
+    def append(self, data_point):
+        """Store a data point and return its IP index"""
+        n = self.count % self.capacity
+        if self.count >= self.capacity:
+            self.keys.discard((float(self.ts[n]), int(self.ip_idx[n])))
+        self.ts[n] = data_point['timestamp']
+        idx = self.index_for(data_point['ip'], data_point['name'])
+        self.keys.add((data_point['timestamp'], idx))
+        self.ip_idx[n] = idx
+        self.value[n] = data_point['value']
+        self.is_master[n] = data_point['is_master']
+        self.count += 1
+        return idx
+    
+    def clear(self):
+        self.count = 0
+        self.ip_table = []
+        self.ip_index = {}
+        self.names = []
+        self.keys.clear()
+    
+    def contains(self, timestamp, ip):
+        """Check whether a point with this timestamp and IP was already stored"""
+        idx = self.ip_index.get(ip)
+        if idx is None:
+            return False
+        return (timestamp, idx) in self.keys
 
 # Session-based logging
 current_log_file = None
 current_log_writer = None
-session_data_buffer = []
-all_masters_in_session = set()
+current_binary_file = None
+pending_rows = []  # formatted CSV lines not yet written to current_log_file
+_log_node_fields = {}  # (ip, name) -> the two CSV fields, quoted once per session
+session_data_buffer = SessionBuffer()
+all_masters_in_session = set()  # SessionBuffer IP indices
 session_start_time = None
 
+# Running master durations, updated per data point instead of rescanning
+# session_data_buffer. master_total_durations only counts time between
+# consecutive MASTER reports from the same node (per-row column);
+# session_master_durations credits each master until the next one takes over
+# (session summary).
+master_total_durations = {}
+session_master_durations = {}
+last_master_ip = None
+last_master_time = None
+
+# Whole-second ISO prefix cache for log timestamps (consecutive rows mostly
+# fall in the same second)
+_last_log_second = None
+_last_log_prefix = ''
+
 # ============================================================================
 # SESSION-BASED LOGGING FUNCTIONS
 # ============================================================================
 
 def start_local_logging_session():
     """Start a new logging session when button is pressed (web server side)"""
-    global current_log_file, current_log_writer, session_data_buffer
+    global current_log_file, current_log_writer, session_data_buffer, current_binary_file
     global all_masters_in_session, session_start_time
+    global last_master_ip, last_master_time, _log_list_cache
     
-    # Close any existing file
-    if current_log_file and not current_log_file.closed:
-        current_log_file.close()
+    # Close any existing file (once the flush thread is done with it); a
+    # binary sidecar is exported into its CSV first, as at stop
+    with log_write_lock:
+        if current_log_file and not current_log_file.closed:
+            if current_binary_file and not current_binary_file.closed:
+                export_binary_log(current_binary_file, current_log_writer)
+                current_binary_file = None
+            write_pending_rows()
+            current_log_file.close()
+        pending_rows.clear()
+        if current_binary_file and not current_binary_file.closed:
+            current_binary_file.close()
     
     # Create new log file with timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -60,22 +277,35 @@ def start_local_logging_session():
     filepath = os.path.join(local_log_directory, filename)
     
     # Open new file
-    current_log_file = open(filepath, 'w', newline='')
+    current_log_file = open(filepath, 'w', newline='', buffering=LOG_WRITE_BUFFER)
     current_log_writer = csv.writer(current_log_file)
     
-    # Write header
-    current_log_file.write(f"# Session started: {datetime.now().isoformat()}\n")
+    # Write header (the file holds data rows only; the summary goes to a
+    # separate file at stop)
     current_log_writer.writerow([
         'timestamp', 'node_ip', 'node_name', 'sensor_value', 
         'is_master', 'master_duration_seconds', 'session_elapsed_seconds'
     ])
     current_log_file.flush()
     
+    # In binary mode rows go to a sidecar file and are exported to the CSV at stop
+    current_binary_file = (open(filepath[:-4] + '.bin', 'wb', buffering=LOG_WRITE_BUFFER)
+                           if LOG_BINARY else None)
+    
     # Reset session tracking
     session_data_buffer.clear()
+    _log_node_fields.clear()
+    log_session_open.set()
     all_masters_in_session = set()
+    master_total_durations.clear()
+    session_master_durations.clear()
+    last_master_ip = None
+    last_master_time = None
     session_start_time = time.time()
     
+    # The file list changed; don't wait for the listing cache to notice
+    _log_list_cache = (None, 0.0, b'')
+    
     print(f"\n{'='*60}")
     print(f"WEB SERVER: LOGGING SESSION STARTED")
     print(f"File: {filename}")
@@ -86,134 +316,243 @@ def start_local_logging_session():
 
 def stop_local_logging_session():
     """Stop current logging session and write summary"""
-    global current_log_file, current_log_writer
+    global current_log_file, current_log_writer, current_binary_file, _log_list_cache
     
     if not current_log_file or current_log_file.closed:
         return
+    log_session_open.clear()
     
     # Calculate session duration
     session_duration = time.time() - session_start_time if session_start_time else 0
     
-    # Write summary section
-    current_log_file.write(f"\n# Session ended: {datetime.now().isoformat()}\n")
-    current_log_file.write(f"# Total session duration: {session_duration:.2f} seconds\n")
-    current_log_file.write(f"\n# MASTER SUMMARY (Devices that became MASTER):\n")
-    current_log_file.write("# IP Address,Name,Total Duration (seconds)\n")
+    # Write the remaining rows and close the data file once the flush thread
+    # is done with it
+    with log_write_lock:
+        if current_binary_file:
+            export_binary_log(current_binary_file, current_log_writer)
+            current_binary_file = None
+        write_pending_rows()
+        current_log_file.flush()
+        current_log_file.close()
     
     # Calculate master durations from session data
     master_durations = calculate_master_durations_from_buffer()
     
-    for ip in sorted(all_masters_in_session):
-        # Find node name from session data
-        node_name = "UNKNOWN"
-        for point in session_data_buffer:
-            if point['ip'] == ip:
-                node_name = point['name']
-                break
-        
-        duration = master_durations.get(ip, 0.0)
-        current_log_file.write(f"# {ip},{node_name},{duration:.2f}\n")
+    # Resolve each master's IP, name and duration once for the file and console
+    master_summary = [
+        (ip, name, master_durations.get(ip, 0.0))
+        for ip, name in sorted(
+            (session_data_buffer.ip_table[idx], session_data_buffer.names[idx])
+            for idx in all_masters_in_session
+        )
+    ]
     
-    # Close file
-    current_log_file.close()
+    # Write the summary next to the data file; written to a temp file and
+    # renamed so a crash never leaves a partial summary
+    summary_path = current_log_file.name[:-4] + '.summary.txt'
+    with tempfile.NamedTemporaryFile('w', dir=local_log_directory, prefix='.summary_',
+                                     suffix='.tmp', delete=False) as tmp:
+        tmp.write(f"# Session started: {datetime.fromtimestamp(session_start_time).isoformat()}\n")
+        tmp.write(f"# Session ended: {datetime.now().isoformat()}\n")
+        tmp.write(f"# Total session duration: {session_duration:.2f} seconds\n")
+        tmp.write(f"\n# MASTER SUMMARY (Devices that became MASTER):\n")
+        tmp.write("# IP Address,Name,Total Duration (seconds)\n")
+        tmp.write("".join(
+            f"# {ip},{node_name},{duration:.2f}\n" for ip, node_name, duration in master_summary
+        ))
+    os.replace(tmp.name, summary_path)
+    _log_list_cache = (None, 0.0, b'')  # final size of the closed log
     
     filename = os.path.basename(current_log_file.name)
     
     print(f"\n{'='*60}")
     print(f"WEB SERVER: LOGGING SESSION STOPPED")
     print(f"File: {filename}")
+    print(f"Summary: {os.path.basename(summary_path)}")
     print(f"  Duration: {session_duration:.2f} seconds")
     print(f" Masters: {len(all_masters_in_session)}")
-    for ip in sorted(all_masters_in_session):
-        node_name = "UNKNOWN"
-        for point in session_data_buffer:
-            if point['ip'] == ip:
-                node_name = point['name']
-                break
-        duration = master_durations.get(ip, 0.0)
+    for ip, node_name, duration in master_summary:
         print(f"   • {node_name} ({ip}): {duration:.2f}s")
     print(f"{'='*60}\n")
     
     current_log_file = None
     current_log_writer = None
 
-def log_data_point_to_file(data_point):
-    """Write a single data point to the current log file"""
-    global current_log_writer, current_log_file
+def format_log_timestamp(timestamp):
+    """Format a timestamp like datetime.fromtimestamp(timestamp).isoformat()"""
+    global _last_log_second, _last_log_prefix
+    
+    second = int(timestamp)
+    micro = round((timestamp - second) * 1e6)
+    if micro >= 1000000:
+        second += 1
+        micro -= 1000000
+    
+    if second != _last_log_second:
+        _last_log_prefix = datetime.fromtimestamp(second).isoformat()
+        _last_log_second = second
+    
+    return f"{_last_log_prefix}.{micro:06d}" if micro else _last_log_prefix
+
+def log_data_points_to_file(data_points):
+    """Write the points of one POST that are not logged yet to the current log file"""
+    global last_master_ip, last_master_time
     
     if not current_log_file or current_log_file.closed:
         return
     
     try:
-        # Store in buffer for summary calculation
-        session_data_buffer.append(data_point)
-        
-        # Track all masters
-        if data_point['is_master']:
-            all_masters_in_session.add(data_point['ip'])
-        
-        # Calculate session elapsed time
+        # Calculate session elapsed time (once per batch)
         session_elapsed = time.time() - session_start_time if session_start_time else 0
         
-        # Calculate master duration up to this point
-        master_duration = calculate_master_duration_for_ip(data_point['ip'])
+        for data_point in data_points:
+            # Each POST resends the whole graph window; skip points already logged
+            if session_data_buffer.contains(data_point['timestamp'], data_point['ip']):
+                continue
+            
+            # Store in buffer for summary calculation
+            known_ips = len(session_data_buffer.ip_table)
+            ip_idx = session_data_buffer.append(data_point)
+            
+            # Track all masters and their running durations
+            ip = session_data_buffer.ip_table[ip_idx]
+            if data_point['is_master']:
+                all_masters_in_session.add(ip_idx)
+                
+                timestamp = data_point['timestamp']
+                if last_master_ip and last_master_time:
+                    segment = timestamp - last_master_time
+                    session_master_durations[last_master_ip] = \
+                        session_master_durations.get(last_master_ip, 0.0) + segment
+                    if last_master_ip == ip:
+                        master_total_durations[ip] = master_total_durations.get(ip, 0.0) + segment
+                
+                last_master_ip = ip
+                last_master_time = timestamp
+            
+            # Calculate master duration up to this point
+            master_duration = master_total_durations.get(ip, 0.0)
+            
+            if current_binary_file:
+                if ip_idx >= known_ips:
+                    node = f"{ip},{session_data_buffer.names[ip_idx]}".encode()
+                    current_binary_file.write(_NODE_RECORD.pack(b'N', ip_idx, len(node)) + node)
+                current_binary_file.write(_POINT_RECORD.pack(
+                    b'P', data_point['timestamp'], ip_idx, data_point['value'],
+                    bool(data_point['is_master']), master_duration, session_elapsed
+                ))
+                continue
+            
+            # Queue the formatted line; lines are written in batches
+            node = (data_point['ip'], data_point['name'])
+            node_fields = _log_node_fields.get(node)
+            if node_fields is None:
+                node_fields = _log_node_fields[node] = csv_fields(node)
+            pending_rows.append(
+                f"{format_log_timestamp(data_point['timestamp'])},{node_fields},"
+                f"{data_point['value']},{data_point['is_master']},"
+                f"{master_duration:.2f},{session_elapsed:.2f}\r\n"
+            )
         
-        # Write row
-        current_log_writer.writerow([
-            datetime.fromtimestamp(data_point['timestamp']).isoformat(),
-            data_point['ip'],
-            data_point['name'],
-            data_point['value'],
-            data_point['is_master'],
-            f"{master_duration:.2f}",
-            f"{session_elapsed:.2f}"
-        ])
-        current_log_file.flush()
+        if LOG_UNBUFFERED:
+            with log_write_lock:
+                write_pending_rows()
+                current_log_file.flush()
+        elif len(pending_rows) >= LOG_BATCH_ROWS:
+            log_rows_ready.set()  # the flush thread writes the batch
         
     except Exception as e:
         print(f" Error writing to log file: {e}")
 
-def calculate_master_duration_for_ip(target_ip):
-    """Calculate how long a specific IP has been master so far in this session"""
-    duration = 0.0
-    last_master_ip = None
-    last_time = None
+def csv_fields(fields):
+    """Join fields into part of a CSV line, quoted the way csv.writer does"""
+    line = io.StringIO()
+    csv.writer(line, lineterminator='').writerow(fields)
+    return line.getvalue()
+
+def write_pending_rows():
+    """Write queued lines to the log file in one write() call"""
+    if pending_rows:
+        current_log_file.write(''.join(pending_rows))
+        pending_rows.clear()
+
+def export_binary_log(binary_file, writer):
+    """Close a binary session log, write its points as CSV rows and remove it"""
+    binary_path = binary_file.name
+    binary_file.close()
     
-    for point in session_data_buffer:
-        if point['is_master']:
-            if last_master_ip == point['ip'] and last_time:
-                duration_segment = point['timestamp'] - last_time
-                if point['ip'] == target_ip:
-                    duration += duration_segment
-            
-            last_master_ip = point['ip']
-            last_time = point['timestamp']
+    with open(binary_path, 'rb') as f:
+        data = f.read()
     
-    return duration
+    nodes = {}
+    rows = []
+    offset = 0
+    while offset < len(data):
+        tag = data[offset:offset + 1]
+        if tag == b'N':
+            _, ip_idx, length = _NODE_RECORD.unpack_from(data, offset)
+            offset += _NODE_RECORD.size
+            nodes[ip_idx] = data[offset:offset + length].decode().split(',', 1)
+            offset += length
+        elif tag == b'P' and offset + _POINT_RECORD.size <= len(data):
+            _, timestamp, ip_idx, value, is_master, master_duration, elapsed = \
+                _POINT_RECORD.unpack_from(data, offset)
+            offset += _POINT_RECORD.size
+            ip, name = nodes[ip_idx]
+            rows.append([
+                format_log_timestamp(timestamp), ip, name, value,
+                is_master, f"{master_duration:.2f}", f"{elapsed:.2f}"
+            ])
+        else:
+            print(f" Truncated binary log record at offset {offset}")
+            break
+    
+    writer.writerows(rows)
+    os.remove(binary_path)
 
-def calculate_master_durations_from_buffer():
-    """Calculate total master duration for all IPs from session buffer"""
-    master_durations = {}
-    last_master_ip = None
-    last_time = None
+def log_flush_loop():
+    """Write queued log rows and flush the session log, off the request threads
     
-    for point in session_data_buffer:
-        if point['is_master']:
-            if last_master_ip and last_time:
-                duration = point['timestamp'] - last_time
-                if last_master_ip not in master_durations:
-                    master_durations[last_master_ip] = 0.0
-                master_durations[last_master_ip] += duration
-            
-            last_master_ip = point['ip']
-            last_time = point['timestamp']
+    Runs every LOG_FLUSH_INTERVAL, or as soon as a full batch is queued. The
+    rows are taken under log_lock, but written under log_write_lock only, so
+    requests keep logging while the disk write is in progress. Full batches
+    only fill the file buffer, which reaches disk one LOG_WRITE_BUFFER-sized
+    write() at a time; the explicit flush happens once per LOG_FLUSH_INTERVAL.
+    """
+    last_flush = time.monotonic()
+    while True:
+        log_rows_ready.wait(LOG_FLUSH_INTERVAL)
+        log_rows_ready.clear()
+        now = time.monotonic()
+        flush_due = now - last_flush >= LOG_FLUSH_INTERVAL
+        if flush_due:
+            last_flush = now
+        with log_lock:
+            rows = pending_rows[:]
+            pending_rows.clear()
+            log_file, binary_file = current_log_file, current_binary_file
+            log_write_lock.acquire()
+        try:
+            if log_file and not log_file.closed:
+                if rows:
+                    log_file.write(''.join(rows))
+                if flush_due:
+                    log_file.flush()
+            if flush_due and binary_file and not binary_file.closed:
+                binary_file.flush()
+        except Exception as e:
+            print(f" Error flushing log file: {e}")
+        finally:
+            log_write_lock.release()
+
+def calculate_master_durations_from_buffer():
+    """Return total master duration for all IPs in the current session"""
+    master_durations = dict(session_master_durations)
     
     # Add final duration if session ended with a master
-    if last_master_ip and last_time and session_start_time:
-        final_duration = time.time() - last_time
-        if last_master_ip not in master_durations:
-            master_durations[last_master_ip] = 0.0
-        master_durations[last_master_ip] += final_duration
+    if last_master_ip and last_master_time and session_start_time:
+        final_duration = time.time() - last_master_time
+        master_durations[last_master_ip] = master_durations.get(last_master_ip, 0.0) + final_duration
     
     return master_durations
 
@@ -221,86 +560,215 @@ def calculate_master_durations_from_buffer():
 # LOG FILE ANALYSIS FUNCTIONS
 # ============================================================================
 
-def analyze_log_file(filepath):
-    """Analyze a log file and return visualization data"""
-    try:
-        data_points = []
-        master_summary = {}
-        all_nodes = {}
-        
-        with open(filepath, 'r') as f:
-            lines = f.readlines()
+def read_log_points(filepath):
+    """Parse a log file with the csv module; returns (columns, master_info)
+    
+    columns is (timestamp, name_code, names, value): numpy arrays sorted by
+    timestamp, with name_code indexing into the names list.
+    """
+    timestamps = []
+    ips = []
+    name_codes = []
+    values = []
+    masters = []
+    names = []
+    name_index = {}
+    
+    # Master durations are folded into the parsing pass; rows are written in
+    # time order, so this only needs redoing if that turns out not to hold
+    master_info = {}
+    last_master_ip = None
+    last_time = None
+    in_order = True
+    previous_timestamp = None
+    
+    with open(filepath, 'r', newline='', buffering=1 << 20) as f:
+        # Parse data rows
+        in_data_section = False
+        for row in csv.reader(f):
+            # Skip comments and blank lines
+            if not row or not row[0].strip() or row[0].startswith('#'):
+                continue
             
-            # Parse data rows
-            in_data_section = False
-            for line in lines:
-                line = line.strip()
-                
-                # Skip comments and headers
-                if line.startswith('#') or not line:
+            # Check for header
+            if row[0] == 'timestamp':
+                in_data_section = True
+                continue
+            
+            if in_data_section and len(row) >= 5:
+                try:
+                    ip = sys.intern(row[1])
+                    name = row[2]
+                    value = int(row[3])
+                    is_master = row[4].strip().lower() == 'true'
+                    
+                    # Parse timestamp
+                    try:
+                        timestamp = datetime.fromisoformat(row[0].strip()).timestamp()
+                    except:
+                        continue
+                    
+                except (ValueError, IndexError):
                     continue
                 
-                # Check for header
-                if line.startswith('timestamp,'):
-                    in_data_section = True
-                    continue
+                code = name_index.get(name)
+                if code is None:
+                    code = name_index[name] = len(names)
+                    names.append(sys.intern(name))
                 
-                if in_data_section and ',' in line:
-                    parts = line.split(',')
-                    if len(parts) >= 5:
-                        try:
-                            timestamp_str = parts[0]
-                            ip = parts[1]
-                            name = parts[2]
-                            value = int(parts[3])
-                            is_master = parts[4].lower() == 'true'
-                            
-                            # Parse timestamp
-                            try:
-                                timestamp = datetime.fromisoformat(timestamp_str).timestamp()
-                            except:
-                                continue
-                            
-                            data_points.append({
-                                'timestamp': timestamp,
-                                'ip': ip,
-                                'name': name,
-                                'value': value,
-                                'is_master': is_master
-                            })
-                            
-                            if ip not in all_nodes:
-                                all_nodes[ip] = name
-                                
-                        except (ValueError, IndexError):
-                            continue
-        
-        if not data_points:
-            return None
-        
-        data_points.sort(key=lambda x: x['timestamp'])
-        
-        # Calculate master durations from raw data
-        master_info = {}
-        for ip, name in all_nodes.items():
-            master_info[ip] = {
-                'name': name,
-                'duration': 0.0,
-                'count': 0
-            }
+                timestamps.append(timestamp)
+                ips.append(ip)
+                name_codes.append(code)
+                values.append(value)
+                masters.append(is_master)
+                
+                if ip not in master_info:
+                    master_info[ip] = {'name': names[code], 'duration': 0.0, 'count': 0}
+                
+                if previous_timestamp is not None and timestamp < previous_timestamp:
+                    in_order = False
+                previous_timestamp = timestamp
+                
+                if is_master:
+                    if last_master_ip == ip and last_time:
+                        master_info[ip]['duration'] += timestamp - last_time
+                        master_info[ip]['count'] += 1
+                    
+                    last_master_ip = ip
+                    last_time = timestamp
+    
+    timestamp = np.array(timestamps, dtype=np.float64)
+    name_code = np.array(name_codes, dtype=np.intp)
+    value = np.array(values, dtype=np.int64)
+    
+    if not in_order:
+        order = np.argsort(timestamp, kind='stable')
+        timestamp = timestamp[order]
+        name_code = name_code[order]
+        value = value[order]
         
+        # Recalculate master durations from the sorted data
+        for info in master_info.values():
+            info['duration'] = 0.0
+            info['count'] = 0
         last_master_ip = None
         last_time = None
         
-        for point in data_points:
-            if point['is_master']:
-                if last_master_ip == point['ip'] and last_time:
-                    duration = point['timestamp'] - last_time
-                    master_info[point['ip']]['duration'] += duration
-                    master_info[point['ip']]['count'] += 1
+        for i in order.tolist():
+            if masters[i]:
+                if last_master_ip == ips[i] and last_time:
+                    master_info[ips[i]]['duration'] += timestamps[i] - last_time
+                    master_info[ips[i]]['count'] += 1
                 
-                last_master_ip = point['ip']
-                last_time = point['timestamp']
+                last_master_ip = ips[i]
+                last_time = timestamps[i]
+    
+    return (timestamp, name_code, names, value), master_info
+
+def lines_before_header(filepath):
+    """Count the lines ahead of the "timestamp,..." header row of a log file"""
+    with open(filepath, 'rb') as f:
+        for count, line in enumerate(f):
+            if line.startswith(b'timestamp,'):
+                return count
+    return 0
+
+def read_log_points_pandas(filepath):
+    """Parse a log file with pandas' C CSV reader; returns (columns, master_info)
+    
+    The result has the same layout as read_log_points().
+    """
+    columns = ['timestamp', 'node_ip', 'node_name', 'sensor_value', 'is_master']
+    # Both readers parse straight from a memory map of the file rather than
+    # copying it through read() calls
+    if PYARROW_AVAILABLE:
+        # pyarrow takes the first line as the header, so skip what precedes
+        # the real one (RPi and older server logs start with "# Session
+        # started: ..."). Later comment lines (summaries in older logs) have
+        # the wrong field count and are skipped with the other bad rows, or
+        # fail timestamp parsing.
+        with pa.memory_map(filepath) as source:
+            df = pa_csv.read_csv(
+                source,
+                read_options=pa_csv.ReadOptions(block_size=1 << 20,
+                                                skip_rows=lines_before_header(filepath)),
+                parse_options=pa_csv.ParseOptions(invalid_row_handler=lambda row: 'skip'),
+                convert_options=pa_csv.ConvertOptions(
+                    include_columns=columns, column_types={c: pa.string() for c in columns}
+                )
+            ).to_pandas()
+    else:
+        df = pd.read_csv(
+            filepath, comment='#', dtype=str, keep_default_na=False,
+            usecols=columns, on_bad_lines='skip', memory_map=True
+        )
+    
+    timestamp_text = df['timestamp'].str.strip()
+    value = pd.to_numeric(df['sensor_value'].str.strip(), errors='coerce')
+    parsed = pd.to_datetime(timestamp_text, errors='coerce', format='ISO8601')
+    
+    # Naive log timestamps are local time; convert the same way as
+    # datetime.timestamp() (whole seconds + microseconds / 1e6)
+    local = parsed.dt.tz_localize(tzlocal(), ambiguous='NaT', nonexistent='NaT')
+    ns = (local - pd.Timestamp(0, tz='UTC')).to_numpy(dtype='timedelta64[ns]').astype(np.int64)
+    timestamp = (ns // 10**9).astype(np.float64) + ((ns % 10**9) // 1000) / 1e6
+    timestamp[local.isna().to_numpy()] = np.nan
+    
+    # Times pandas cannot localize (DST transitions) go through datetime
+    for i in np.flatnonzero(parsed.notna().to_numpy() & np.isnan(timestamp)):
+        timestamp[i] = datetime.fromisoformat(timestamp_text.iat[i]).timestamp()
+    
+    valid = (~np.isnan(timestamp) & value.notna().to_numpy() &
+             (value.fillna(0) % 1 == 0).to_numpy())
+    df = df[valid]
+    timestamp = timestamp[valid]
+    value = value[valid].astype(np.int64)
+    is_master = (df['is_master'].str.strip().str.lower() == 'true').to_numpy()
+    
+    if not len(df):
+        return (timestamp, np.empty(0, dtype=np.intp), [], np.empty(0, dtype=np.int64)), {}
+    
+    # Node indices in order of first appearance, like the row-by-row parser
+    ip_codes, ip_uniques = pd.factorize(df['node_ip'])
+    name_codes, name_uniques = pd.factorize(df['node_name'])
+    ips = [sys.intern(ip) for ip in ip_uniques]
+    names = [sys.intern(name) for name in name_uniques]
+    _, first_rows = np.unique(ip_codes, return_index=True)
+    
+    order = np.argsort(timestamp, kind='stable')
+    timestamp = timestamp[order]
+    ip_codes = ip_codes[order]
+    is_master = is_master[order]
+    
+    # Master time: gaps between consecutive MASTER rows from the same node
+    master_ts = timestamp[is_master]
+    master_ip = ip_codes[is_master]
+    same = master_ip[1:] == master_ip[:-1]
+    durations = np.bincount(master_ip[1:][same], weights=np.diff(master_ts)[same],
+                            minlength=len(ips))
+    counts = np.bincount(master_ip[1:][same], minlength=len(ips))
+    
+    master_info = {
+        ips[code]: {
+            'name': names[name_codes[first_rows[code]]],
+            'duration': float(durations[code]),
+            'count': int(counts[code])
+        }
+        for code in range(len(ips))
+    }
+    return (timestamp, name_codes[order], names, value.to_numpy()[order]), master_info
+
+def analyze_log_file(filepath):
+    """Analyze a log file and return visualization data"""
+    try:
+        if PANDAS_AVAILABLE:
+            columns, master_info = read_log_points_pandas(filepath)
+        else:
+            columns, master_info = read_log_points(filepath)
+        timestamp, name_code, names, value = columns
+        
+        if not len(timestamp):
+            return None
         
         # Format master durations by IP
         master_durations = {}
@@ -313,13 +781,25 @@ def analyze_log_file(filepath):
                     'count': info['count']
                 }
         
+        # Chart series per node name (first-appearance order) as parallel
+        # arrays of seconds from the start and sensor values, rather than one
+        # object per point
+        x = np.round(timestamp - timestamp[0], 3)
+        by_name = np.argsort(name_code, kind='stable')
+        bounds = np.searchsorted(name_code[by_name], np.arange(len(names) + 1))
+        _, first_rows = np.unique(name_code, return_index=True)
+        series = {}
+        for code in np.argsort(first_rows).tolist():
+            rows = by_name[bounds[code]:bounds[code + 1]]
+            series[names[code]] = {'x': x[rows].tolist(), 'y': value[rows].tolist()}
+        
         return {
-            'data_points': data_points,
+            'series': series,
             'master_durations': master_durations,
-            'start_time': datetime.fromtimestamp(data_points[0]['timestamp']).isoformat(),
-            'end_time': datetime.fromtimestamp(data_points[-1]['timestamp']).isoformat(),
-            'duration': data_points[-1]['timestamp'] - data_points[0]['timestamp'],
-            'total_points': len(data_points),
+            'start_time': datetime.fromtimestamp(timestamp[0]).isoformat(),
+            'end_time': datetime.fromtimestamp(timestamp[-1]).isoformat(),
+            'duration': float(timestamp[-1] - timestamp[0]),
+            'total_points': len(timestamp),
             'num_masters': len(master_durations)
         }
     
@@ -328,272 +808,839 @@ def analyze_log_file(filepath):
         return None
 
 # ============================================================================
-# HTML TEMPLATE - PART 1
+# PRECOMPRESSED STATIC CONTENT
 # ============================================================================
 
-HTML_PART1 = '''<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>RPi Light Swarm Monitor</title>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body {
-            font-family: 'Segoe UI', sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }
-        .container {
-            max-width: 1400px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 20px;
-            box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-            overflow: hidden;
-        }
-        .header {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 30px;
-            text-align: center;
-        }
-        .header h1 { font-size: 2.5em; margin-bottom: 10px; }
-        .header p { font-size: 1.1em; opacity: 0.9; }
-        .status-bar {
-            background: #f8f9fa;
-            padding: 15px 30px;
-            border-bottom: 2px solid #e0e0e0;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            flex-wrap: wrap;
-            gap: 10px;
-        }
-        .status-dot {
-            width: 12px;
-            height: 12px;
-            border-radius: 50%;
-            background: #dc3545;
-            display: inline-block;
-            margin-right: 10px;
-            animation: pulse 2s infinite;
-        }
-        .status-dot.connected {
-            background: #28a745;
-        }
-        @keyframes pulse {
-            0%, 100% { opacity: 1; }
-            50% { opacity: 0.5; }
-        }
-        .logging-status {
-            padding: 8px 20px;
-            border-radius: 20px;
-            font-weight: bold;
-            font-size: 0.9em;
-            display: flex;
-            align-items: center;
-            gap: 8px;
-        }
-        .logging-status.active {
-            background: #28a745;
-            color: white;
-            animation: recording 1.5s infinite;
-        }
-        .logging-status.inactive {
-            background: #6c757d;
-            color: white;
-        }
-        @keyframes recording {
-            0%, 100% { box-shadow: 0 0 0 0 rgba(40, 167, 69, 0.7); }
-            50% { box-shadow: 0 0 0 10px rgba(40, 167, 69, 0); }
-        }
-        .tabs {
-            display: flex;
-            background: #f8f9fa;
-            border-bottom: 2px solid #e0e0e0;
-            overflow-x: auto;
-        }
-        .tab {
-            padding: 15px 30px;
-            cursor: pointer;
-            border: none;
-            background: transparent;
-            font-weight: bold;
-            color: #666;
-            transition: all 0.3s;
-            white-space: nowrap;
-        }
-        .tab:hover {
-            background: #e9ecef;
-        }
-        .tab.active {
-            background: white;
-            color: #667eea;
-            border-bottom: 3px solid #667eea;
-        }
-        .tab-content {
-            display: none;
-            padding: 20px;
-        }
-        .tab-content.active {
-            display: block;
-        }
-        .master-section {
-            background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-            color: white;
-            padding: 30px;
-            text-align: center;
-            margin: 20px;
-            border-radius: 15px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-        }
-        .master-section h2 {
-            font-size: 1.8em;
-            margin-bottom: 15px;
-        }
-        .master-section .value {
-            font-size: 3em;
-            font-weight: bold;
-        }
-        .master-section .ip {
-            font-size: 1em;
-            opacity: 0.9;
-            margin-top: 10px;
-        }
-        .nodes-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
-            gap: 20px;
-            padding: 20px;
-        }
-        .node-card {
-            background: white;
-            border-radius: 15px;
-            padding: 20px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-            border-left: 5px solid #ccc;
-            transition: transform 0.2s;
-        }
-        .node-card:hover {
-            transform: translateY(-5px);
-            box-shadow: 0 10px 25px rgba(0,0,0,0.15);
-        }
-        .node-card.master {
-            background: linear-gradient(135deg, #ffeaa7 0%, #fdcb6e 100%);
-            border-left: 5px solid #f39c12;
-        }
-        .node-card h3 {
-            margin-bottom: 10px;
-            font-size: 1.3em;
-        }
-        .node-card .value {
-            font-size: 2.5em;
-            font-weight: bold;
-            margin: 10px 0;
-        }
-        .node-card .ip {
-            font-size: 0.85em;
-            color: #666;
-        }
-        .chart-container {
-            background: white;
-            border-radius: 15px;
-            padding: 25px;
-            margin: 20px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
+class StaticAsset:
+    """A static response body encoded and compressed once at import"""
+    
+    def __init__(self, text, mimetype, cache_control='no-cache'):
+        body = text.encode('utf-8')
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        self.digest = hashlib.md5(body).hexdigest()
+        self.variants = {'identity': body, 'gzip': gzip.compress(body, 9)}
+        if BROTLI_AVAILABLE:
+            self.variants['br'] = brotli.compress(body, quality=11)
+    
+    def response(self):
+        """Serve the best encoding the client accepts, or 304 if its copy is current"""
+        accepted = request.accept_encodings
+        encoding = 'identity'
+        for candidate in ('br', 'gzip'):
+            if candidate in self.variants and accepted[candidate]:
+                encoding = candidate
+                break
+        
+        etag = f"{self.digest}-{encoding}"
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(self.variants[encoding], mimetype=self.mimetype)
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+        
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = self.cache_control
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
+
+# Fingerprinted assets never change under the same URL, so clients may keep them
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+
+# ============================================================================
+# DASHBOARD STYLESHEET
+# ============================================================================
+
+CSS_TEXT = '''* { margin: 0; padding: 0; box-sizing: border-box; }
+body {
+    font-family: 'Segoe UI', sans-serif;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    min-height: 100vh;
+    padding: 20px;
+}
+.container {
+    max-width: 1400px;
+    margin: 0 auto;
+    background: white;
+    border-radius: 20px;
+    box-shadow: 0 20px 60px rgba(0,0,0,0.3);
+    overflow: hidden;
+}
+.header {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    padding: 30px;
+    text-align: center;
+}
+.header h1 { font-size: 2.5em; margin-bottom: 10px; }
+.header p { font-size: 1.1em; opacity: 0.9; }
+.status-bar {
+    background: #f8f9fa;
+    padding: 15px 30px;
+    border-bottom: 2px solid #e0e0e0;
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    flex-wrap: wrap;
+    gap: 10px;
+}
+.status-dot {
+    width: 12px;
+    height: 12px;
+    border-radius: 50%;
+    background: #dc3545;
+    display: inline-block;
+    margin-right: 10px;
+    animation: pulse 2s infinite;
+}
+.status-dot.connected {
+    background: #28a745;
+}
+@keyframes pulse {
+    0%, 100% { opacity: 1; }
+    50% { opacity: 0.5; }
+}
+.logging-status {
+    padding: 8px 20px;
+    border-radius: 20px;
+    font-weight: bold;
+    font-size: 0.9em;
+    display: flex;
+    align-items: center;
+    gap: 8px;
+}
+.logging-status.active {
+    background: #28a745;
+    color: white;
+    animation: recording 1.5s infinite;
+}
+.logging-status.inactive {
+    background: #6c757d;
+    color: white;
+}
+@keyframes recording {
+    0%, 100% { box-shadow: 0 0 0 0 rgba(40, 167, 69, 0.7); }
+    50% { box-shadow: 0 0 0 10px rgba(40, 167, 69, 0); }
+}
+.tabs {
+    display: flex;
+    background: #f8f9fa;
+    border-bottom: 2px solid #e0e0e0;
+    overflow-x: auto;
+}
+.tab {
+    padding: 15px 30px;
+    cursor: pointer;
+    border: none;
+    background: transparent;
+    font-weight: bold;
+    color: #666;
+    transition: all 0.3s;
+    white-space: nowrap;
+}
+.tab:hover {
+    background: #e9ecef;
+}
+.tab.active {
+    background: white;
+    color: #667eea;
+    border-bottom: 3px solid #667eea;
+}
+.tab-content {
+    display: none;
+    padding: 20px;
+}
+.tab-content.active {
+    display: block;
+}
+.master-section {
+    background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
+    color: white;
+    padding: 30px;
+    text-align: center;
+    margin: 20px;
+    border-radius: 15px;
+    box-shadow: 0 10px 30px rgba(0,0,0,0.2);
+}
+.master-section h2 {
+    font-size: 1.8em;
+    margin-bottom: 15px;
+}
+.master-section .value {
+    font-size: 3em;
+    font-weight: bold;
+}
+.master-section .ip {
+    font-size: 1em;
+    opacity: 0.9;
+    margin-top: 10px;
+}
+.nodes-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
+    gap: 20px;
+    padding: 20px;
+}
+.node-card {
+    background: white;
+    border-radius: 15px;
+    padding: 20px;
+    box-shadow: 0 5px 15px rgba(0,0,0,0.1);
+    border-left: 5px solid #ccc;
+    transition: transform 0.2s;
+}
+.node-card:hover {
+    transform: translateY(-5px);
+    box-shadow: 0 10px 25px rgba(0,0,0,0.15);
+}
+.node-card.master {
+    background: linear-gradient(135deg, #ffeaa7 0%, #fdcb6e 100%);
+    border-left: 5px solid #f39c12;
+}
+.node-card h3 {
+    margin-bottom: 10px;
+    font-size: 1.3em;
+}
+.node-card .value {
+    font-size: 2.5em;
+    font-weight: bold;
+    margin: 10px 0;
+}
+.node-card .ip {
+    font-size: 0.85em;
+    color: #666;
+}
+.chart-container {
+    background: white;
+    border-radius: 15px;
+    padding: 25px;
+    margin: 20px;
+    box-shadow: 0 5px 15px rgba(0,0,0,0.1);
+}
+.chart-container h3 {
+    margin-bottom: 20px;
+    color: #333;
+    font-size: 1.3em;
+}
+.log-selector {
+    background: white;
+    border-radius: 15px;
+    padding: 25px;
+    margin: 20px;
+    box-shadow: 0 5px 15px rgba(0,0,0,0.1);
+}
+.log-selector label {
+    display: block;
+    margin-bottom: 10px;
+    font-weight: bold;
+    color: #333;
+}
+.log-selector select {
+    width: 100%;
+    padding: 12px;
+    border: 2px solid #e0e0e0;
+    border-radius: 8px;
+    font-size: 1em;
+    background: white;
+    cursor: pointer;
+}
+.log-selector select:focus {
+    outline: none;
+    border-color: #667eea;
+}
+.btn {
+    padding: 12px 24px;
+    border: none;
+    border-radius: 8px;
+    cursor: pointer;
+    font-weight: bold;
+    margin: 5px;
+    text-decoration: none;
+    display: inline-block;
+    transition: all 0.3s;
+}
+.btn-primary {
+    background: #667eea;
+    color: white;
+}
+.btn-primary:hover {
+    background: #5568d3;
+    transform: translateY(-2px);
+    box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4);
+}
+canvas {
+    max-height: 400px;
+}
+.log-file-item {
+    padding: 15px;
+    border-bottom: 1px solid #eee;
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    transition: background 0.2s;
+}
+.log-file-item:hover {
+    background: #f8f9fa;
+}
+.log-file-item:last-child {
+    border-bottom: none;
+}
+.info-box {
+    background: #e3f2fd;
+    border-left: 4px solid #2196f3;
+    padding: 20px;
+    margin: 20px;
+    border-radius: 8px;
+    line-height: 1.6;
+}
+.info-box strong {
+    color: #1976d2;
+}
+#logInfo {
+    background: #f8f9fa;
+    padding: 20px;
+    border-radius: 8px;
+    margin-top: 15px;
+}
+#logInfo p {
+    margin: 8px 0;
+    font-size: 0.95em;
+}
+'''
+
+# ============================================================================
+# DASHBOARD SCRIPT
+# ============================================================================
+
+JS_TEXT = '''let sensorChart, durationChart, logSensorChart, logDurationChart;
+const els = {};  // elements looked up once in initCharts()
+const nodeCards = new Map();  // ip -> node card element
+const sensorSeries = new Map();  // name -> {dataset, points, n}, reused between updates
+
+// Border and translucent fill colors per node name, built once
+const COLORS = Object.freeze({
+    'RED': { border: '#e74c3c', fill: '#e74c3c33' },
+    'BLUE': { border: '#3498db', fill: '#3498db33' },
+    'GREEN': { border: '#2ecc71', fill: '#2ecc7133' },
+    'YELLOW': { border: '#f1c40f', fill: '#f1c40f33' },
+    'PURPLE': { border: '#9b59b6', fill: '#9b59b633' }
+});
+const DEFAULT_COLOR = Object.freeze({ border: '#999', fill: '#99999933' });
+const colorFor = name => COLORS[name] || DEFAULT_COLOR;
+
+function switchTab(event, tabName) {
+    document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
+    event.target.classList.add('active');
+    document.querySelectorAll('.tab-content').forEach(c => c.classList.remove('active'));
+    document.getElementById(tabName).classList.add('active');
+    
+    if (tabName === 'logs') loadLogFiles();
+    if (tabName === 'viewer') populateLogSelector();
+    updateLiveFeed();
+}
+
+function initCharts() {
+    for (const id of ['statusDot', 'statusText', 'loggingStatus', 'masterTitle',
+                      'masterValue', 'masterIP', 'nodesGrid', 'realtime',
+                      'logFileSelect', 'logInfo', 'logStart', 'logDuration',
+                      'logPoints', 'logMasters', 'localLogsList', 'rpiLogsList',
+                      'nodeCardTpl', 'logItemTpl']) {
+        els[id] = document.getElementById(id);
+    }
+    
+    const chartDefaults = {
+        responsive: true,
+        maintainAspectRatio: true,
+        interaction: {
+            intersect: false,
+            mode: 'index'
         }
-        .chart-container h3 {
-            margin-bottom: 20px;
-            color: #333;
-            font-size: 1.3em;
+    };
+    
+    sensorChart = new Chart(document.getElementById('sensorChart'), {
+        type: 'line',
+        data: { datasets: [] },
+        options: {
+            ...chartDefaults,
+            animation: false,
+            parsing: false,
+            plugins: {
+                decimation: { enabled: true, algorithm: 'lttb', samples: 60 }
+            },
+            scales: {
+                x: {
+                    type: 'linear',
+                    title: { display: true, text: 'Seconds Ago' },
+                    reverse: true,
+                    min: 0,
+                    max: 30
+                },
+                y: {
+                    title: { display: true, text: 'Sensor Value' },
+                    min: 0,
+                    max: 4095
+                }
+            }
         }
-        .log-selector {
-            background: white;
-            border-radius: 15px;
-            padding: 25px;
-            margin: 20px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
+    });
+    
+    durationChart = new Chart(document.getElementById('durationChart'), {
+        type: 'bar',
+        data: {
+            labels: [],
+            datasets: [{
+                label: 'Duration (seconds)',
+                data: [],
+                backgroundColor: []
+            }]
+        },
+        options: {
+            ...chartDefaults,
+            scales: {
+                y: {
+                    beginAtZero: true,
+                    title: { display: true, text: 'Seconds as Master' }
+                }
+            }
         }
-        .log-selector label {
-            display: block;
-            margin-bottom: 10px;
-            font-weight: bold;
-            color: #333;
+    });
+    
+    logSensorChart = new Chart(document.getElementById('logSensorChart'), {
+        type: 'line',
+        data: { datasets: [] },
+        options: {
+            ...chartDefaults,
+            scales: {
+                x: {
+                    type: 'linear',
+                    title: { display: true, text: 'Time (seconds from start)' }
+                },
+                y: {
+                    title: { display: true, text: 'Sensor Value' },
+                    min: 0,
+                    max: 4095
+                }
+            }
         }
-        .log-selector select {
-            width: 100%;
-            padding: 12px;
-            border: 2px solid #e0e0e0;
-            border-radius: 8px;
-            font-size: 1em;
-            background: white;
-            cursor: pointer;
+    });
+    
+    logDurationChart = new Chart(document.getElementById('logDurationChart'), {
+        type: 'bar',
+        data: {
+            labels: [],
+            datasets: [{
+                label: 'Master Duration (seconds)',
+                data: [],
+                backgroundColor: []
+            }]
+        },
+        options: {
+            ...chartDefaults,
+            indexAxis: 'y',
+            scales: {
+                x: {
+                    beginAtZero: true,
+                    title: { display: true, text: 'Duration (seconds)' }
+                }
+            },
+            plugins: {
+                tooltip: {
+                    callbacks: {
+                        label: function(context) {
+                            return 'Duration: ' + context.parsed.x.toFixed(2) + ' seconds';
+                        }
+                    }
+                }
+            }
         }
-        .log-selector select:focus {
-            outline: none;
-            border-color: #667eea;
+    });
+}
+
+// Concurrent callers (tab switch, selector, refresh) share one request
+let logsPromise = null;
+function getLogs() {
+    if (!logsPromise) {
+        logsPromise = fetch('/api/logs/all')
+            .then(res => res.json())
+            .finally(() => { logsPromise = null; });
+    }
+    return logsPromise;
+}
+
+async function populateLogSelector() {
+    try {
+        const data = await getLogs();
+        const select = els.logFileSelect;
+        select.innerHTML = '<option value="">-- Choose a log file --</option>';
+        
+        if (data.local && data.local.length > 0) {
+            const g = document.createElement('optgroup');
+            g.label = '💾 Local Logs';
+            data.local.forEach(f => {
+                const o = document.createElement('option');
+                o.value = `local:${f.name}`;
+                o.textContent = `${f.name} (${f.size})`;
+                g.appendChild(o);
+            });
+            select.appendChild(g);
         }
-        .btn {
-            padding: 12px 24px;
-            border: none;
-            border-radius: 8px;
-            cursor: pointer;
-            font-weight: bold;
-            margin: 5px;
-            text-decoration: none;
-            display: inline-block;
-            transition: all 0.3s;
+        
+        if (data.rpi && data.rpi.length > 0) {
+            const g = document.createElement('optgroup');
+            g.label = '🔴 RPi Logs';
+            data.rpi.forEach(f => {
+                const o = document.createElement('option');
+                o.value = `rpi:${f.name}`;
+                o.textContent = `${f.name} (${f.size})`;
+                g.appendChild(o);
+            });
+            select.appendChild(g);
         }
-        .btn-primary {
-            background: #667eea;
-            color: white;
+    } catch (error) {
+        console.error('Error loading log files:', error);
+    }
+}
+
+async function loadLogVisualization() {
+    const val = els.logFileSelect.value;
+    if (!val) {
+        els.logInfo.style.display = 'none';
+        return;
+    }
+    
+    try {
+        const [source, filename] = val.split(':');
+        const res = await fetch(`/api/logs/analyze/${source}/${filename}`);
+        const analysis = await res.json();
+        
+        if (analysis.error) {
+            alert('Error: ' + analysis.error);
+            return;
         }
-        .btn-primary:hover {
-            background: #5568d3;
-            transform: translateY(-2px);
-            box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4);
+        
+        els.logStart.textContent = 
+            new Date(analysis.start_time).toLocaleString();
+        els.logDuration.textContent = 
+            analysis.duration.toFixed(2) + ' seconds';
+        els.logPoints.textContent = 
+            analysis.total_points.toLocaleString();
+        els.logMasters.textContent = 
+            analysis.num_masters + ' device(s)';
+        els.logInfo.style.display = 'block';
+        
+        const nodeData = {};
+        for (const [name, s] of Object.entries(analysis.series)) {
+            const points = new Array(s.x.length);
+            for (let i = 0; i < points.length; i++) {
+                points[i] = { x: s.x[i], y: s.y[i] };
+            }
+            nodeData[name] = points;
         }
-        canvas {
-            max-height: 400px;
+        
+        logSensorChart.data.datasets = Object.keys(nodeData).map(name => ({
+            label: name,
+            data: nodeData[name],
+            borderColor: colorFor(name).border,
+            backgroundColor: colorFor(name).fill,
+            borderWidth: 2,
+            tension: 0.4
+        }));
+        logSensorChart.update();
+        
+        const labels = [];
+        const durations = [];
+        const bgColors = [];
+        
+        Object.entries(analysis.master_durations).forEach(([label, info]) => {
+            labels.push(label);
+            durations.push(info.duration);
+            bgColors.push(colorFor(info.name).border);
+        });
+        
+        logDurationChart.data.labels = labels;
+        logDurationChart.data.datasets[0].data = durations;
+        logDurationChart.data.datasets[0].backgroundColor = bgColors;
+        logDurationChart.update();
+        
+    } catch (error) {
+        console.error('Error loading visualization:', error);
+        alert('Error loading log file visualization');
+    }
+}
+
+function updateNodeCards(nodes) {
+    if (nodeCards.size === 0) els.nodesGrid.innerHTML = '';
+    
+    for (const [ip, node] of Object.entries(nodes)) {
+        let card = nodeCards.get(ip);
+        if (!card) {
+            card = els.nodeCardTpl.content.firstElementChild.cloneNode(true);
+            card.children[2].textContent = ip;
+            nodeCards.set(ip, card);
+            els.nodesGrid.appendChild(card);
         }
-        .log-file-item {
-            padding: 15px;
-            border-bottom: 1px solid #eee;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            transition: background 0.2s;
+        
+        card.classList.toggle('master', !!node.is_master);
+        const title = (node.is_master ? '👑 ' : '') + node.name;
+        if (card._title !== title) {
+            card.children[0].textContent = title;
+            card._title = title;
         }
-        .log-file-item:hover {
-            background: #f8f9fa;
+        if (card._value !== node.value) {
+            card.children[1].textContent = node.value;
+            card._value = node.value;
         }
-        .log-file-item:last-child {
-            border-bottom: none;
+    }
+    
+    for (const [ip, card] of nodeCards) {
+        if (!(ip in nodes)) {
+            card.remove();
+            nodeCards.delete(ip);
         }
-        .info-box {
-            background: #e3f2fd;
-            border-left: 4px solid #2196f3;
-            padding: 20px;
-            margin: 20px;
-            border-radius: 8px;
-            line-height: 1.6;
+    }
+}
+
+function updateSensorChart(graphData) {
+    const now = Date.now() / 1000;
+    let changed = false;
+    
+    // Count points per node; datasets are created in order of first appearance
+    for (const series of sensorSeries.values()) series.n = 0;
+    for (const p of graphData) {
+        let series = sensorSeries.get(p.name);
+        if (!series) {
+            series = {
+                dataset: {
+                    label: p.name,
+                    data: [],
+                    borderColor: colorFor(p.name).border,
+                    backgroundColor: colorFor(p.name).fill,
+                    borderWidth: 2,
+                    tension: 0.4
+                },
+                points: [],
+                n: 0
+            };
+            sensorSeries.set(p.name, series);
+            changed = true;
         }
-        .info-box strong {
-            color: #1976d2;
+        series.n++;
+    }
+    
+    // Resize each node's point pool; nodes that sent nothing are dropped
+    for (const [name, series] of sensorSeries) {
+        if (series.n === 0) {
+            sensorSeries.delete(name);
+            changed = true;
+            continue;
         }
-        #logInfo {
-            background: #f8f9fa;
-            padding: 20px;
-            border-radius: 8px;
-            margin-top: 15px;
+        const points = series.points;
+        while (points.length < series.n) points.push({ x: 0, y: 0 });
+        points.length = series.n;
+        series.dataset.data = points;
+    }
+    
+    // Fill newest first, so x (seconds ago) is ascending as decimation expects
+    for (const p of graphData) {
+        const series = sensorSeries.get(p.name);
+        const point = series.points[--series.n];
+        point.x = now - p.timestamp;
+        point.y = p.value;
+    }
+    
+    if (changed) {
+        sensorChart.data.datasets = Array.from(sensorSeries.values(), s => s.dataset);
+    }
+    sensorChart.update('none');
+}
+
+function updateUI(data) {
+    els.statusDot.classList.add('connected');
+    els.statusText.textContent = 'Connected to RPi';
+    
+    const loggingStatus = els.loggingStatus;
+    if (data.logging_active) {
+        loggingStatus.innerHTML = '🔴 RECORDING';
+        loggingStatus.className = 'logging-status active';
+    } else {
+        loggingStatus.innerHTML = '⏹️ NOT LOGGING';
+        loggingStatus.className = 'logging-status inactive';
+    }
+    
+    if (data.current_master) {
+        const m = data.current_master;
+        els.masterTitle.textContent = 
+            `MASTER: ${m.name}`;
+        els.masterValue.textContent = m.value;
+        els.masterIP.textContent = `IP: ${m.ip}`;
+    } else {
+        els.masterTitle.textContent = 'No MASTER';
+        els.masterValue.textContent = '--';
+        els.masterIP.textContent = '';
+    }
+    
+    if (data.nodes && Object.keys(data.nodes).length > 0) {
+        updateNodeCards(data.nodes);
+    }
+    
+    if (data.graph_data && data.graph_data.length > 0) {
+        updateSensorChart(data.graph_data);
+    }
+    
+    if (data.master_durations) {
+        durationChart.data.labels = Object.keys(data.master_durations);
+        durationChart.data.datasets[0].data = Object.values(data.master_durations);
+        durationChart.data.datasets[0].backgroundColor = 
+            Object.keys(data.master_durations).map(n => colorFor(n).border);
+        durationChart.update('none');
+    }
+}
+
+function renderLogList(list, files, source, emptyText) {
+    if (!files || files.length === 0) {
+        list.innerHTML = `<p style="padding: 20px; color: #999;">${emptyText}</p>`;
+        return;
+    }
+    
+    // Clone the row template into a fragment and swap it in with one mutation
+    const template = els.logItemTpl.content.firstElementChild;
+    const fragment = document.createDocumentFragment();
+    for (const f of files) {
+        const item = template.cloneNode(true);
+        item.querySelector('strong').textContent = f.name;
+        item.querySelector('small').textContent = `${f.size} • Modified: ${f.modified}`;
+        item.querySelector('.data-link').href = `/api/logs/${source}/${f.name}`;
+        const summaryLink = item.querySelector('.summary-link');
+        if (f.summary) {
+            summaryLink.href = `/api/logs/${source}/${f.summary}`;
+        } else {
+            summaryLink.remove();
         }
-        #logInfo p {
-            margin: 8px 0;
-            font-size: 0.95em;
+        fragment.appendChild(item);
+    }
+    list.replaceChildren(fragment);
+}
+
+async function loadLogFiles() {
+    try {
+        const data = await getLogs();
+        renderLogList(els.localLogsList, data.local,
+                      'local', 'No local logs yet');
+        renderLogList(els.rpiLogsList, data.rpi,
+                      'rpi', 'No RPi logs available');
+    } catch (error) {
+        console.error('Error loading log files:', error);
+    }
+}
+
+// Render at most once per animation frame; frames (and so renders) pause
+// while the tab is hidden
+let pendingData = null;
+function scheduleRender(data) {
+    if (!data.timestamp) return;
+    if (pendingData === null) {
+        requestAnimationFrame(() => {
+            const latest = pendingData;
+            pendingData = null;
+            updateUI(latest);
+        });
+    }
+    pendingData = data;
+}
+
+async function fetchData() {
+    try {
+        const res = await fetch('/api/data');
+        scheduleRender(await res.json());
+    } catch (error) {
+        console.error('Error fetching data:', error);
+    }
+}
+
+let eventSource = null;
+let streamRetryTimer = null;
+function connectStream() {
+    if (eventSource) return;
+    eventSource = new EventSource('/api/stream');
+    eventSource.onopen = () => clearTimeout(pollTimer);
+    eventSource.onmessage = e => scheduleRender(JSON.parse(e.data));
+    eventSource.onerror = () => {
+        els.statusDot.classList.remove('connected');
+        els.statusText.textContent = 'Reconnecting...';
+        if (eventSource.readyState === EventSource.CLOSED) {
+            // Refused (server at its stream limit): poll, try again later
+            eventSource = null;
+            schedulePoll();
+            clearTimeout(streamRetryTimer);
+            streamRetryTimer = setTimeout(updateLiveFeed, 30000);
         }
-    </style>
+    };
+}
+
+function disconnectStream() {
+    if (eventSource) {
+        eventSource.close();
+        eventSource = null;
+    }
+}
+
+// Polling fallback: fast on the Real-time tab, slower elsewhere, and
+// nearly idle while the page is hidden
+let pollTimer = null;
+function schedulePoll() {
+    clearTimeout(pollTimer);
+    const visible = document.visibilityState === 'visible';
+    const onRealtime = els.realtime.classList.contains('active');
+    const delay = !visible ? 30000 : onRealtime ? 500 : 5000;
+    pollTimer = setTimeout(async () => {
+        await fetchData();
+        if (!eventSource) schedulePoll();
+    }, delay);
+}
+
+// The stream is only held open while the page is visible
+function updateLiveFeed() {
+    if (!window.EventSource) {
+        schedulePoll();
+    } else if (document.visibilityState === 'visible') {
+        connectStream();
+    } else {
+        disconnectStream();
+    }
+}
+
+initCharts();
+document.addEventListener('visibilitychange', updateLiveFeed);
+if (!window.EventSource) fetchData();
+updateLiveFeed();
+loadLogFiles();
+'''
+
+if MINIFY_AVAILABLE:
+    CSS_ASSET = StaticAsset(rcssmin.cssmin(CSS_TEXT), 'text/css', IMMUTABLE_CACHE)
+    JS_ASSET = StaticAsset(rjsmin.jsmin(JS_TEXT), 'application/javascript', IMMUTABLE_CACHE)
+else:
+    CSS_ASSET = StaticAsset(CSS_TEXT, 'text/css', IMMUTABLE_CACHE)
+    JS_ASSET = StaticAsset(JS_TEXT, 'application/javascript', IMMUTABLE_CACHE)
+
+# Served by name from memory; a new build changes the name, not the content
+STATIC_ASSETS = {
+    f'app.{CSS_ASSET.digest[:10]}.css': CSS_ASSET,
+    f'app.{JS_ASSET.digest[:10]}.js': JS_ASSET,
+}
+
+# ============================================================================
+# HTML TEMPLATE
+# ============================================================================
+
+HTML_PAGE = f'''<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>RPi Light Swarm Monitor</title>
+    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
+    <link rel="stylesheet" href="/static/app.{CSS_ASSET.digest[:10]}.css">
 </head>
 <body>
     <div class="container">
@@ -617,10 +1664,7 @@ HTML_PART1 = '''<!DOCTYPE html>
             <button class="tab" onclick="switchTab(event, 'viewer')">📈 Log Viewer</button>
             <button class="tab" onclick="switchTab(event, 'logs')">📁 Log Files</button>
         </div>
-'''
 
-
-HTML_PART2 = '''
         <div id="realtime" class="tab-content active">
             <div class="info-box">
                 <strong>🔘 How to Use:</strong><br>
@@ -712,591 +1756,380 @@ HTML_PART2 = '''
         </div>
     </div>
 
-    <script>
-        let sensorChart, durationChart, logSensorChart, logDurationChart;
-        
-        const colors = {
-            'RED': '#e74c3c',
-            'BLUE': '#3498db',
-            'GREEN': '#2ecc71',
-            'YELLOW': '#f1c40f',
-            'PURPLE': '#9b59b6'
-        };
-        
-        function switchTab(event, tabName) {
-            document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
-            event.target.classList.add('active');
-            document.querySelectorAll('.tab-content').forEach(c => c.classList.remove('active'));
-            document.getElementById(tabName).classList.add('active');
-            
-            if (tabName === 'logs') loadLogFiles();
-            if (tabName === 'viewer') populateLogSelector();
-        }
-        
-        function initCharts() {
-            const chartDefaults = {
-                responsive: true,
-                maintainAspectRatio: true,
-                interaction: {
-                    intersect: false,
-                    mode: 'index'
-                }
-            };
-            
-            sensorChart = new Chart(document.getElementById('sensorChart'), {
-                type: 'line',
-                data: { datasets: [] },
-                options: {
-                    ...chartDefaults,
-                    scales: {
-                        x: {
-                            type: 'linear',
-                            title: { display: true, text: 'Seconds Ago' },
-                            reverse: true,
-                            min: 0,
-                            max: 30
-                        },
-                        y: {
-                            title: { display: true, text: 'Sensor Value' },
-                            min: 0,
-                            max: 4095
-                        }
-                    }
-                }
-            });
-            
-            durationChart = new Chart(document.getElementById('durationChart'), {
-                type: 'bar',
-                data: {
-                    labels: [],
-                    datasets: [{
-                        label: 'Duration (seconds)',
-                        data: [],
-                        backgroundColor: []
-                    }]
-                },
-                options: {
-                    ...chartDefaults,
-                    scales: {
-                        y: {
-                            beginAtZero: true,
-                            title: { display: true, text: 'Seconds as Master' }
-                        }
-                    }
-                }
-            });
-            
-            logSensorChart = new Chart(document.getElementById('logSensorChart'), {
-                type: 'line',
-                data: { datasets: [] },
-                options: {
-                    ...chartDefaults,
-                    scales: {
-                        x: {
-                            type: 'linear',
-                            title: { display: true, text: 'Time (seconds from start)' }
-                        },
-                        y: {
-                            title: { display: true, text: 'Sensor Value' },
-                            min: 0,
-                            max: 4095
-                        }
-                    }
-                }
-            });
-            
-            logDurationChart = new Chart(document.getElementById('logDurationChart'), {
-                type: 'bar',
-                data: {
-                    labels: [],
-                    datasets: [{
-                        label: 'Master Duration (seconds)',
-                        data: [],
-                        backgroundColor: []
-                    }]
-                },
-                options: {
-                    ...chartDefaults,
-                    indexAxis: 'y',
-                    scales: {
-                        x: {
-                            beginAtZero: true,
-                            title: { display: true, text: 'Duration (seconds)' }
-                        }
-                    },
-                    plugins: {
-                        tooltip: {
-                            callbacks: {
-                                label: function(context) {
-                                    return 'Duration: ' + context.parsed.x.toFixed(2) + ' seconds';
-                                }
-                            }
-                        }
-                    }
-                }
-            });
-        }
-        
-        async function populateLogSelector() {
-            try {
-                const res = await fetch('/api/logs/all');
-                const data = await res.json();
-                const select = document.getElementById('logFileSelect');
-                select.innerHTML = '<option value="">-- Choose a log file --</option>';
-                
-                if (data.local && data.local.length > 0) {
-                    const g = document.createElement('optgroup');
-                    g.label = '💾 Local Logs';
-                    data.local.forEach(f => {
-                        const o = document.createElement('option');
-                        o.value = `local:${f.name}`;
-                        o.textContent = `${f.name} (${f.size})`;
-                        g.appendChild(o);
-                    });
-                    select.appendChild(g);
-                }
-                
-                if (data.rpi && data.rpi.length > 0) {
-                    const g = document.createElement('optgroup');
-                    g.label = '🔴 RPi Logs';
-                    data.rpi.forEach(f => {
-                        const o = document.createElement('option');
-                        o.value = `rpi:${f.name}`;
-                        o.textContent = `${f.name} (${f.size})`;
-                        g.appendChild(o);
-                    });
-                    select.appendChild(g);
-                }
-            } catch (error) {
-                console.error('Error loading log files:', error);
-            }
-        }
-        
-        async function loadLogVisualization() {
-            const val = document.getElementById('logFileSelect').value;
-            if (!val) {
-                document.getElementById('logInfo').style.display = 'none';
-                return;
-            }
-            
-            try {
-                const [source, filename] = val.split(':');
-                const res = await fetch(`/api/logs/analyze/${source}/${filename}`);
-                const analysis = await res.json();
-                
-                if (analysis.error) {
-                    alert('Error: ' + analysis.error);
-                    return;
-                }
-                
-                document.getElementById('logStart').textContent = 
-                    new Date(analysis.start_time).toLocaleString();
-                document.getElementById('logDuration').textContent = 
-                    analysis.duration.toFixed(2) + ' seconds';
-                document.getElementById('logPoints').textContent = 
-                    analysis.total_points.toLocaleString();
-                document.getElementById('logMasters').textContent = 
-                    analysis.num_masters + ' device(s)';
-                document.getElementById('logInfo').style.display = 'block';
-                
-                const nodeData = {};
-                const startTime = analysis.data_points[0].timestamp;
-                
-                analysis.data_points.forEach(p => {
-                    if (!nodeData[p.name]) nodeData[p.name] = [];
-                    nodeData[p.name].push({
-                        x: p.timestamp - startTime,
-                        y: p.value
-                    });
-                });
-                
-                logSensorChart.data.datasets = Object.keys(nodeData).map(name => ({
-                    label: name,
-                    data: nodeData[name],
-                    borderColor: colors[name] || '#999',
-                    backgroundColor: (colors[name] || '#999') + '33',
-                    borderWidth: 2,
-                    tension: 0.4
-                }));
-                logSensorChart.update();
-                
-                const labels = [];
-                const durations = [];
-                const bgColors = [];
-                
-                Object.entries(analysis.master_durations).forEach(([label, info]) => {
-                    labels.push(label);
-                    durations.push(info.duration);
-                    bgColors.push(colors[info.name] || '#999');
-                });
-                
-                logDurationChart.data.labels = labels;
-                logDurationChart.data.datasets[0].data = durations;
-                logDurationChart.data.datasets[0].backgroundColor = bgColors;
-                logDurationChart.update();
-                
-            } catch (error) {
-                console.error('Error loading visualization:', error);
-                alert('Error loading log file visualization');
-            }
-        }
-        
-        function updateUI(data) {
-            document.getElementById('statusDot').classList.add('connected');
-            document.getElementById('statusText').textContent = 'Connected to RPi';
-            
-            const loggingStatus = document.getElementById('loggingStatus');
-            if (data.logging_active) {
-                loggingStatus.innerHTML = '🔴 RECORDING';
-                loggingStatus.className = 'logging-status active';
-            } else {
-                loggingStatus.innerHTML = '⏹️ NOT LOGGING';
-                loggingStatus.className = 'logging-status inactive';
-            }
-            
-            if (data.current_master) {
-                const m = data.current_master;
-                document.getElementById('masterTitle').textContent = 
-                    `MASTER: ${m.name}`;
-                document.getElementById('masterValue').textContent = m.value;
-                document.getElementById('masterIP').textContent = `IP: ${m.ip}`;
-            } else {
-                document.getElementById('masterTitle').textContent = 'No MASTER';
-                document.getElementById('masterValue').textContent = '--';
-                document.getElementById('masterIP').textContent = '';
-            }
-            
-            if (data.nodes && Object.keys(data.nodes).length > 0) {
-                let html = '';
-                for (const [ip, node] of Object.entries(data.nodes)) {
-                    const masterClass = node.is_master ? 'master' : '';
-                    const masterBadge = node.is_master ? '👑 ' : '';
-                    html += `
-                        <div class="node-card ${masterClass}">
-                            <h3>${masterBadge}${node.name}</h3>
-                            <div class="value">${node.value}</div>
-                            <div class="ip">${ip}</div>
-                        </div>
-                    `;
-                }
-                document.getElementById('nodesGrid').innerHTML = html;
-            }
-            
-            if (data.graph_data && data.graph_data.length > 0) {
-                const nodeData = {};
-                const now = Date.now() / 1000;
-                
-                data.graph_data.forEach(p => {
-                    if (!nodeData[p.name]) nodeData[p.name] = [];
-                    nodeData[p.name].push({
-                        x: now - p.timestamp,
-                        y: p.value
-                    });
-                });
-                
-                sensorChart.data.datasets = Object.keys(nodeData).map(name => ({
-                    label: name,
-                    data: nodeData[name],
-                    borderColor: colors[name] || '#999',
-                    backgroundColor: (colors[name] || '#999') + '33',
-                    borderWidth: 2,
-                    tension: 0.4
-                }));
-                sensorChart.update('none');
-            }
-            
-            if (data.master_durations) {
-                durationChart.data.labels = Object.keys(data.master_durations);
-                durationChart.data.datasets[0].data = Object.values(data.master_durations);
-                durationChart.data.datasets[0].backgroundColor = 
-                    Object.keys(data.master_durations).map(n => colors[n] || '#999');
-                durationChart.update('none');
-            }
-        }
-        
-        async function loadLogFiles() {
-            try {
-                const res = await fetch('/api/logs/all');
-                const data = await res.json();
-                
-                let localHtml = '';
-                if (data.local && data.local.length > 0) {
-                    data.local.forEach(f => {
-                        localHtml += `
-                            <div class="log-file-item">
-                                <div>
-                                    <strong>${f.name}</strong><br>
-                                    <small>${f.size} • Modified: ${f.modified}</small>
-                                </div>
-                                <a href="/api/logs/local/${f.name}" 
-                                   class="btn btn-primary" download>
-                                    ⬇️ Download
-                                </a>
-                            </div>
-                        `;
-                    });
-                } else {
-                    localHtml = '<p style="padding: 20px; color: #999;">No local logs yet</p>';
-                }
-                document.getElementById('localLogsList').innerHTML = localHtml;
-                
-                let rpiHtml = '';
-                if (data.rpi && data.rpi.length > 0) {
-                    data.rpi.forEach(f => {
-                        rpiHtml += `
-                            <div class="log-file-item">
-                                <div>
-                                    <strong>${f.name}</strong><br>
-                                    <small>${f.size} • Modified: ${f.modified}</small>
-                                </div>
-                                <a href="/api/logs/rpi/${f.name}" 
-                                   class="btn btn-primary" download>
-                                    ⬇️ Download
-                                </a>
-                            </div>
-                        `;
-                    });
-                } else {
-                    rpiHtml = '<p style="padding: 20px; color: #999;">No RPi logs available</p>';
-                }
-                document.getElementById('rpiLogsList').innerHTML = rpiHtml;
-                
-            } catch (error) {
-                console.error('Error loading log files:', error);
-            }
-        }
-        
-        async function fetchData() {
-            try {
-                const res = await fetch('/api/data');
-                const data = await res.json();
-                if (data.timestamp) {
-                    updateUI(data);
-                }
-            } catch (error) {
-                console.error('Error fetching data:', error);
-            }
-        }
-        
-        initCharts();
-        setInterval(fetchData, 500);
-        fetchData();
-        loadLogFiles();
-    </script>
+    <template id="nodeCardTpl">
+        <div class="node-card"><h3></h3><div class="value"></div><div class="ip"></div></div>
+    </template>
+
+    <template id="logItemTpl">
+        <div class="log-file-item">
+            <div>
+                <strong></strong><br>
+                <small></small>
+            </div>
+            <div>
+                <a class="btn btn-primary summary-link" download>📄 Summary</a>
+                <a class="btn btn-primary data-link" download>⬇️ Download</a>
+            </div>
+        </div>
+    </template>
+
+    <script src="/static/app.{JS_ASSET.digest[:10]}.js" defer></script>
 </body>
 </html>
 '''
 
+INDEX_PAGE = StaticAsset(HTML_PAGE, 'text/html')
 
 # ============================================================================
 # API ROUTES
 # ============================================================================
 
+def lttb_indices(x, y, n_out):
+    """Indices of the points kept by Largest-Triangle-Three-Buckets downsampling"""
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    
+    # First and last points are always kept; the rest is split into n_out - 2
+    # buckets and each bucket keeps the point forming the largest triangle with
+    # the previously kept point and the average of the next bucket
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0] = 0
+    keep[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+def decimate_graph_data(graph_data, points_per_node=GRAPH_POINTS_PER_NODE):
+    """Downsample each node's graph points for the live chart, keeping their order"""
+    by_name = {}
+    for i, point in enumerate(graph_data):
+        by_name.setdefault(point['name'], []).append(i)
+    if all(len(rows) <= points_per_node for rows in by_name.values()):
+        return graph_data
+    
+    kept = []
+    for rows in by_name.values():
+        if len(rows) <= points_per_node:
+            kept.extend(rows)
+            continue
+        x = np.fromiter((graph_data[i]['timestamp'] for i in rows), dtype=np.float64, count=len(rows))
+        y = np.fromiter((graph_data[i]['value'] for i in rows), dtype=np.float64, count=len(rows))
+        kept.extend(rows[j] for j in lttb_indices(x, y, points_per_node))
+    kept.sort()
+    return [graph_data[i] for i in kept]
+
+def publish_latest_data():
+    """Mark latest_data changed and wake every /api/stream client (hold data_lock)"""
+    global state_version
+    with state_changed:
+        state_version += 1
+        state_changed.notify_all()
+
+def latest_data_json():
+    """Return (version, JSON bytes) of the dashboard view of latest_data
+    
+    The view is built the first time a client asks for a new version, so
+    updates nobody reads are never decimated or encoded. Readers of a version
+    that is already encoded only read the latest_json tuple and take no lock.
+    """
+    global latest_json
+    cached = latest_json
+    if cached[0] == state_version:
+        return cached
+    
+    with json_lock:
+        version = state_version
+        if latest_json[0] != version:
+            # The live chart only needs GRAPH_POINTS_PER_NODE points per node;
+            # the full graph_data is still what gets logged
+            snapshot = latest_data
+            if snapshot['graph_data']:
+                snapshot = {**snapshot, 'graph_data': decimate_graph_data(snapshot['graph_data'])}
+            latest_json = (version, encode_json(snapshot))
+        return latest_json
+
 @app.route('/')
 def index():
     """Serve main dashboard"""
-    full_html = HTML_PART1 + HTML_PART2
-    return render_template_string(full_html)
+    return INDEX_PAGE.response()
+
+@app.route('/static/<filename>')
+def static_asset(filename):
+    """Serve a fingerprinted dashboard stylesheet or script"""
+    asset = STATIC_ASSETS.get(filename)
+    if asset is None:
+        return json_response({'error': 'File not found'}), 404
+    return asset.response()
 
 @app.route('/api/data', methods=['POST'])
 def receive_data():
     """Receive data from Raspberry Pi"""
+    global latest_data
     try:
-        data = request.get_json()
+        data = request_json()
         
         # Handle button press signals
         if 'button_action' in data:
             action = data['button_action']
             
-            with data_lock:
-                if action == 'start':
-                    # Start logging session on web server
+            if action == 'start':
+                # Start logging session on web server
+                with log_lock:
                     filename = start_local_logging_session()
-                    latest_data['logging_active'] = True
-                    latest_data['current_log_file'] = filename
-                    
-                elif action == 'stop':
-                    # Stop logging session
+                with data_lock:
+                    latest_data = {**latest_data, 'logging_active': True,
+                                   'current_log_file': filename}
+                    publish_latest_data()
+                
+            elif action == 'stop':
+                # Stop logging session
+                with log_lock:
                     stop_local_logging_session()
-                    latest_data['logging_active'] = False
-                    latest_data['current_log_file'] = None
+                with data_lock:
+                    latest_data = {**latest_data, 'logging_active': False,
+                                   'current_log_file': None}
+                    publish_latest_data()
             
-            return jsonify({
+            return json_response({
                 'status': 'success',
                 'action': action
             }), 200
         
         # Regular data update
         with data_lock:
-            latest_data.update(data)
-            latest_data['last_update'] = time.time()
+            latest_data = {**latest_data, **data, 'last_update': time.time()}
+            publish_latest_data()
             
             # Store RPi log directory path
             global rpi_log_files_directory
             if 'log_directory' in data:
                 rpi_log_files_directory = data['log_directory']
             
-            # If logging is active, write data points to file
-            if latest_data.get('logging_active', False):
-                # Process graph_data and write to log file
-                if 'graph_data' in data and data['graph_data']:
-                    for point in data['graph_data']:
-                        # Check if this point is already logged
-                        # (simple check: only log if not in buffer or is newer)
-                        if not any(
-                            p['timestamp'] == point['timestamp'] and 
-                            p['ip'] == point['ip'] 
-                            for p in session_data_buffer
-                        ):
-                            log_data_point_to_file(point)
+            logging_active = latest_data.get('logging_active', False)
+        
+        # If logging is active, write data points to file. This only holds
+        # log_lock, so dashboard reads of latest_data are not blocked by it;
+        # with no session open here, log_lock is not taken at all.
+        if logging_active and log_session_open.is_set() and data.get('graph_data'):
+            with log_lock:
+                log_data_points_to_file(data['graph_data'])
         
-        return jsonify({'status': 'success'}), 200
+        return json_response({'status': 'success'}), 200
         
     except Exception as e:
         print(f"Error receiving data: {e}")
         import traceback
         traceback.print_exc()
-        return jsonify({'status': 'error', 'message': str(e)}), 400
+        return json_response({'status': 'error', 'message': str(e)}), 400
 
 @app.route('/api/data', methods=['GET'])
 def get_data():
-    """Get current data for dashboard"""
-    with data_lock:
-        response = latest_data.copy()
-        return jsonify(response)
+    """Get current data for dashboard (encoded once per state version)"""
+    version, payload = latest_data_json()
+    
+    # Pollers that already hold this version get a bodiless 304
+    response = Response(payload, mimetype='application/json')
+    response.set_etag(f"{state_etag_prefix}-{version}")
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+@app.route('/api/stream')
+def stream_data():
+    """Push latest_data to the dashboard as Server-Sent Events when it changes
+    
+    Each stream holds a server thread, so at most MAX_STREAMS are open at
+    once (others get a 503 and poll /api/data) and each ends after
+    STREAM_MAX_LIFETIME, freeing its thread until the browser reconnects.
+    """
+    if not stream_slots.acquire(blocking=False):
+        return json_response({'error': 'Too many streams, poll /api/data'}), 503
+    
+    def events():
+        version = None
+        deadline = time.monotonic() + STREAM_MAX_LIFETIME
+        while time.monotonic() < deadline:
+            with state_changed:
+                if version == state_version:
+                    state_changed.wait(timeout=STREAM_KEEPALIVE_INTERVAL)
+                changed = version != state_version
+            if changed:
+                version, payload = latest_data_json()
+                yield b'data: ' + payload + b'\n\n'
+            else:
+                yield b': keepalive\n\n'
+    
+    response = Response(events(), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    response.call_on_close(stream_slots.release)
+    return response
 
 @app.route('/api/status')
 def get_status():
     """Check connection status"""
-    with data_lock:
-        if latest_data['last_update']:
-            time_since = time.time() - latest_data['last_update']
-            connected = time_since < 5
-        else:
-            connected = False
-            time_since = None
-        
-        return jsonify({
-            'is_connected': connected,
-            'time_since_update': time_since,
-            'logging_active': latest_data.get('logging_active', False),
-            'current_log_file': latest_data.get('current_log_file')
-        })
+    snapshot = latest_data
+    if snapshot['last_update']:
+        time_since = time.time() - snapshot['last_update']
+        connected = time_since < 5
+    else:
+        connected = False
+        time_since = None
+    
+    return json_response({
+        'is_connected': connected,
+        'time_since_update': time_since,
+        'logging_active': snapshot.get('logging_active', False),
+        'current_log_file': snapshot.get('current_log_file')
+    })
+
+def directory_mtime(directory):
+    """Modification time of directory in ns, or None if it does not exist"""
+    try:
+        return os.stat(directory).st_mtime_ns
+    except (OSError, TypeError):
+        return None
+
+def scan_log_directory(directory):
+    """List the swarm_log_*.csv files in directory, newest first
+    
+    A log whose session summary was written next to it gets the summary's
+    file name in 'summary'.
+    """
+    files = []
+    summaries = set()
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.name.startswith('swarm_log_'):
+                continue
+            if entry.name.endswith('.summary.txt'):
+                summaries.add(entry.name)
+            elif entry.name.endswith('.csv'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append({
+                    'name': entry.name,
+                    'size': f"{stat.st_size / 1024:.1f} KB",
+                    'modified': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
+                })
+    for f in files:
+        summary = f['name'][:-4] + '.summary.txt'
+        if summary in summaries:
+            f['summary'] = summary
+    files.sort(key=lambda x: x['modified'], reverse=True)
+    return files
 
 @app.route('/api/logs/all')
 def list_all_logs():
     """List all log files from both local and RPi"""
+    global _log_list_cache
     try:
-        result = {'local': [], 'rpi': []}
-        
-        # Get local logs
-        if os.path.exists(local_log_directory):
-            for filename in os.listdir(local_log_directory):
-                if filename.startswith('swarm_log_') and filename.endswith('.csv'):
-                    filepath = os.path.join(local_log_directory, filename)
-                    stat = os.stat(filepath)
-                    result['local'].append({
-                        'name': filename,
-                        'size': f"{stat.st_size / 1024:.1f} KB",
-                        'modified': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
-                    })
-        
-        result['local'].sort(key=lambda x: x['modified'], reverse=True)
-        
-        # Get RPi logs
-        if rpi_log_files_directory and os.path.exists(rpi_log_files_directory):
-            for filename in os.listdir(rpi_log_files_directory):
-                if filename.startswith('swarm_log_') and filename.endswith('.csv'):
-                    filepath = os.path.join(rpi_log_files_directory, filename)
-                    try:
-                        stat = os.stat(filepath)
-                        result['rpi'].append({
-                            'name': filename,
-                            'size': f"{stat.st_size / 1024:.1f} KB",
-                            'modified': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
-                        })
-                    except:
-                        pass
-        
-        result['rpi'].sort(key=lambda x: x['modified'], reverse=True)
+        # Rescan only when a directory changed (file created, renamed or
+        # removed) or the cached listing is older than LOG_LIST_MAX_AGE, so
+        # the size of a log that is still being written stays current
+        key = (directory_mtime(local_log_directory), rpi_log_files_directory,
+               directory_mtime(rpi_log_files_directory))
+        cached_key, expires, payload = _log_list_cache
+        now = time.monotonic()
+        if key != cached_key or now >= expires:
+            result = {
+                'local': scan_log_directory(local_log_directory) if key[0] is not None else [],
+                'rpi': scan_log_directory(rpi_log_files_directory) if key[2] is not None else []
+            }
+            payload = encode_json(result)
+            _log_list_cache = (key, now + LOG_LIST_MAX_AGE, payload)
         
-        return jsonify(result)
+        return Response(payload, mimetype='application/json')
         
     except Exception as e:
         print(f"Error listing logs: {e}")
-        return jsonify({'local': [], 'rpi': [], 'error': str(e)})
+        return json_response({'local': [], 'rpi': [], 'error': str(e)})
+
+def resolve_log_path(source, filename):
+    """Map a dashboard (source, filename) pair to an absolute log file path
+    
+    Returns (filepath, None), or (None, (error message, HTTP status)).
+    """
+    # Security check: a plain session log name, nothing that could leave the directory
+    if not LOG_FILENAME_RE.fullmatch(filename):
+        return None, ('Invalid filename', 400)
+    
+    if source == 'local':
+        directory = local_log_directory
+    elif source == 'rpi':
+        if not rpi_log_files_directory:
+            return None, ('RPi directory not available', 404)
+        directory = rpi_log_files_directory
+    else:
+        return None, ('Invalid source', 400)
+    
+    # Absolute, since send_file resolves relative paths against the app root
+    filepath = os.path.abspath(os.path.join(directory, filename))
+    if not os.path.isfile(filepath):
+        return None, ('File not found', 404)
+    return filepath, None
 
 @app.route('/api/logs/analyze/<source>/<filename>')
 def analyze_log_endpoint(source, filename):
     """Analyze a log file and return visualization data"""
     try:
-        # Security check
-        if not filename.startswith('swarm_log_') or not filename.endswith('.csv'):
-            return jsonify({'error': 'Invalid filename'}), 400
-        
-        if source == 'local':
-            filepath = os.path.join(local_log_directory, filename)
-        elif source == 'rpi':
-            if not rpi_log_files_directory:
-                return jsonify({'error': 'RPi directory not available'}), 404
-            filepath = os.path.join(rpi_log_files_directory, filename)
-        else:
-            return jsonify({'error': 'Invalid source'}), 400
-        
-        if not os.path.exists(filepath):
-            return jsonify({'error': 'File not found'}), 404
+        # Summaries can be downloaded, but only the data file is analyzed
+        if not filename.endswith('.csv'):
+            return json_response({'error': 'Invalid filename'}), 400
+        filepath, error = resolve_log_path(source, filename)
+        if error:
+            return json_response({'error': error[0]}), error[1]
         
         analysis = analyze_log_file(filepath)
         
         if analysis is None:
-            return jsonify({'error': 'Could not analyze log file'}), 500
+            return json_response({'error': 'Could not analyze log file'}), 500
         
-        return jsonify(analysis)
+        return json_response(analysis)
     
     except Exception as e:
         print(f"Error analyzing log: {e}")
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}), 500
 
 @app.route('/api/logs/local/<filename>')
 def download_local_log(filename):
     """Download local log file"""
     try:
-        # Security check
-        if not filename.startswith('swarm_log_') or not filename.endswith('.csv'):
-            return jsonify({'error': 'Invalid filename'}), 400
-        
-        filepath = os.path.join(local_log_directory, filename)
+        filepath, error = resolve_log_path('local', filename)
+        if error:
+            return json_response({'error': error[0]}), error[1]
         
-        if not os.path.exists(filepath):
-            return jsonify({'error': 'File not found'}), 404
-        
-        return send_file(filepath, as_attachment=True, download_name=filename)
+        # Conditional: ETag/Last-Modified from the file, 304 if unchanged
+        return send_file(filepath, as_attachment=True, download_name=filename,
+                         conditional=True)
         
     except Exception as e:
         print(f"Error downloading local log: {e}")
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}), 500
 
 @app.route('/api/logs/rpi/<filename>')
 def download_rpi_log(filename):
     """Download RPi log file"""
     try:
-        # Security check
-        if not filename.startswith('swarm_log_') or not filename.endswith('.csv'):
-            return jsonify({'error': 'Invalid filename'}), 400
-        
-        if not rpi_log_files_directory:
-            return jsonify({'error': 'RPi directory not available'}), 404
-        
-        filepath = os.path.join(rpi_log_files_directory, filename)
-        
-        if not os.path.exists(filepath):
-            return jsonify({'error': 'File not found'}), 404
+        filepath, error = resolve_log_path('rpi', filename)
+        if error:
+            return json_response({'error': error[0]}), error[1]
         
-        return send_file(filepath, as_attachment=True, download_name=filename)
+        return send_file(filepath, as_attachment=True, download_name=filename,
+                         conditional=True)
         
     except Exception as e:
         print(f"Error downloading RPi log: {e}")
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}), 500
 
 # ============================================================================
 # MAIN EXECUTION
@@ -1330,7 +2163,7 @@ if __name__ == '__main__':
     print("   • All devices that became masters (IP addresses)")
     print("   • How long each device was master (from beginning)")
     print("   • Raw data from each master")
-    print("   • Session summary at end of file")
+    print("   • Session summary in swarm_log_<time>.summary.txt (downloadable next to its log)")
     print("\n Web Dashboard:")
     print("   • Real-time monitoring with live charts")
     print("   • Log file viewer (select any file to visualize)")
@@ -1346,7 +2179,7 @@ if __name__ == '__main__':
     print("\nExample:")
     print("2024-12-05T10:30:01,192.168.137.35,RED,2048,True,5.50,10.00")
     print("2024-12-05T10:30:02,192.168.137.34,BLUE,1024,False,0.00,11.00")
-    print("\nSummary section (at end):")
+    print("\nSummary file (written at stop):")
     print("# MASTER SUMMARY (Devices that became MASTER):")
     print("# IP Address,Name,Total Duration (seconds)")
     print("# 192.168.137.35,RED,120.50")
@@ -1358,19 +2191,29 @@ if __name__ == '__main__':
     print("Press Ctrl+C to stop the server")
     print("="*70 + "\n")
     
+    # Flush session log rows in the background instead of once per row
+    threading.Thread(target=log_flush_loop, daemon=True).start()
+    
     try:
-        app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
+        if WAITRESS_AVAILABLE:
+            # Returns once Ctrl+C stops the server
+            serve(app, host='0.0.0.0', port=5000, threads=SERVER_THREADS)
+        else:
+            app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
     except KeyboardInterrupt:
-        print("\n\n Shutting down server...")
-        
-        # Close any open log file
-        if current_log_file and not current_log_file.closed:
-            print(" Closing active log file...")
-            stop_local_logging_session()
-        
-        print("✓ Server stopped")
-        print("✓ All logs saved\n")
+        pass
     except Exception as e:
         print(f"\n\n Server error: {e}\n")
         import traceback
-        traceback.print_exc()
\ No newline at end of file
+        traceback.print_exc()
+    
+    print("\n\n Shutting down server...")
+    
+    # Close any open log file (under log_lock, like the stop button)
+    with log_lock:
+        if current_log_file and not current_log_file.closed:
+            print(" Closing active log file...")
+            stop_local_logging_session()
+    
+    print("✓ Server stopped")
+    print("✓ All logs saved\n")
\ No newline at end of file